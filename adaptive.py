@@ -0,0 +1,267 @@
+"""Single-pass adaptive Huffman coding (FGK) over ALPHABET, for streams whose counts are unknown.
+
+Encoder and decoder start from the same empty tree and update it after every letter, so
+no code table is sent. A letter seen for the first time goes out as the NYT ("not yet
+transmitted") code plus its 5-bit index. The stream ends with the END symbol, so it
+needs no length header and can be decoded while it arrives.
+"""
+import codecs, time
+from compression import HEADER, NO_NODE, BuildCompression
+from frequency import ALPHABET, CHUNK_SIZE, letter_indices
+
+END = len(ALPHABET)                         ## simbolul de sfârșit de flux, după cele 31 de litere
+SYMBOLS = END + 1
+INDEX_BITS = (SYMBOLS - 1).bit_length()     ## 5 biți pentru un simbol nou
+NYT, INTERNAL = -1, -2                      ## valori din `symbol` pentru nodurile fără literă
+MAX_NODES = 2 * SYMBOLS + 1                 ## SYMBOLS frunze + NYT + nodurile interne
+BYTE_BITS = [tuple((byte >> i) & 1 for i in range(7, -1, -1)) for byte in range(256)]
+
+
+class AdaptiveHuffmanModel:
+    """FGK tree in parallel lists indexed by node id.
+
+    `order` lists the node ids by FGK number (the root is last). The sibling property
+    holds after every update: weights never decrease along `order`, and siblings are
+    next to each other.
+    """
+    def __init__(self):
+        self.weight = [0]
+        self.parent = [NO_NODE]
+        self.left = [NO_NODE]
+        self.right = [NO_NODE]
+        self.symbol = [NYT]
+        self.number = [MAX_NODES - 1]
+        self.order = [NO_NODE] * MAX_NODES
+        self.order[-1] = 0
+        self.root = self.nyt = 0
+        self.leaves = [NO_NODE] * SYMBOLS       ## simbol -> frunza lui
+
+    def _add(self, symbol, number, parent) -> int:
+        node = len(self.weight)
+        self.weight.append(0)
+        self.parent.append(parent)
+        self.left.append(NO_NODE)
+        self.right.append(NO_NODE)
+        self.symbol.append(symbol)
+        self.number.append(number)
+        self.order[number] = node
+        return node
+
+    def code(self, symbol) -> tuple[int, int]:
+        """(value, length) of `symbol` under the current tree, NYT + index for a new one."""
+        node = self.leaves[symbol]
+        new = node == NO_NODE
+        if new:
+            node = self.nyt
+        value = length = 0
+        parent, right, root = self.parent, self.right, self.root
+        while node != root:
+            up = parent[node]
+            if right[up] == node:
+                value |= 1 << length
+            length += 1
+            node = up
+        if new:
+            return value << INDEX_BITS | symbol, length + INDEX_BITS
+        return value, length
+
+    def update(self, symbol):
+        """Counts one more `symbol` and restores the sibling property on the way to the root."""
+        weight, parent, number, order = self.weight, self.parent, self.number, self.order
+        q = self.leaves[symbol]
+        if q == NO_NODE:        ## NYT devine nod intern: copil stâng noul NYT, copil drept litera
+            old = self.nyt
+            n = number[old]
+            self.nyt = self._add(NYT, n - 2, old)
+            q = self.leaves[symbol] = self._add(symbol, n - 1, old)
+            self.left[old], self.right[old], self.symbol[old] = self.nyt, q, INTERNAL
+        last = len(order) - 1
+        while q != NO_NODE:
+            w, lead = weight[q], number[q]
+            while lead < last and weight[order[lead + 1]] == w:
+                lead += 1               ## cel mai mare număr din blocul de greutate w
+            leader = order[lead]
+            if leader != q and leader != parent[q]:
+                self._swap(q, leader)
+            weight[q] = w + 1
+            q = parent[q]
+
+    def _swap(self, a, b):
+        """Exchanges the subtrees rooted at `a` and `b`, and their FGK numbers."""
+        parent, left, right = self.parent, self.left, self.right
+        pa, pb = parent[a], parent[b]
+        if pa == pb:
+            left[pa], right[pa] = right[pa], left[pa]
+        else:
+            if left[pa] == a:
+                left[pa] = b
+            else:
+                right[pa] = b
+            if left[pb] == b:
+                left[pb] = a
+            else:
+                right[pb] = a
+            parent[a], parent[b] = pb, pa
+        na, nb = self.number[a], self.number[b]
+        self.number[a], self.number[b] = nb, na
+        self.order[na], self.order[nb] = b, a
+
+
+class AdaptiveHuffmanEncoder(AdaptiveHuffmanModel):
+    """Streaming encoder: encode() every chunk as it comes, then finish() once.
+
+    Chunks are str, or UTF-8 bytes that end on a character boundary. Bytes come back
+    as soon as they are whole. `letters`, `bits`, `input_bytes` (UTF-8) and `seconds`
+    keep running totals.
+    """
+    FLUSH_BITS = 256        ## acumulatorul rămâne un întreg mic, deci shift-urile sunt ieftine
+
+    def __init__(self):
+        super().__init__()
+        self.pending = self.pending_bits = 0
+        self.letters = self.bits = self.input_bytes = 0
+        self.seconds = 0.0
+
+    def _put(self, symbol, out):
+        value, length = self.code(symbol)
+        self.update(symbol)
+        self.pending = self.pending << length | value
+        self.pending_bits += length
+        self.bits += length
+        if self.pending_bits >= self.FLUSH_BITS:
+            keep = self.pending_bits % 8
+            out += (self.pending >> keep).to_bytes(self.pending_bits // 8, "big")
+            self.pending &= (1 << keep) - 1
+            self.pending_bits = keep
+
+    def encode(self, text) -> bytes:
+        started = time.perf_counter()
+        data = text.encode() if isinstance(text, str) else text
+        indices = letter_indices(data)
+        out = bytearray()
+        for symbol in indices:
+            self._put(symbol, out)
+        self.letters += len(indices)
+        self.input_bytes += len(data)
+        self.seconds += time.perf_counter() - started
+        return bytes(out)
+
+    def finish(self) -> bytes:
+        """END plus zero padding to a whole byte; the encoder cannot be used afterwards."""
+        out = bytearray()
+        self._put(END, out)
+        if self.pending_bits:
+            pad = -self.pending_bits % 8
+            out += (self.pending << pad).to_bytes((self.pending_bits + pad) // 8, "big")
+            self.pending = self.pending_bits = 0
+        return bytes(out)
+
+    def bits_per_letter(self) -> float:
+        return self.bits / self.letters if self.letters else 0.0
+
+
+class AdaptiveHuffmanDecoder(AdaptiveHuffmanModel):
+    """Streaming decoder: decode() returns the letters completed by each chunk of bytes."""
+    def __init__(self):
+        super().__init__()
+        self.node = self.root
+        self.raw_bits = INDEX_BITS      ## arborele gol e doar NYT: primul simbol vine ca index
+        self.raw_value = 0
+        self.done = False
+
+    def decode(self, data) -> str:
+        out = []
+        left, right, symbols = self.left, self.right, self.symbol
+        node, raw_bits, raw_value = self.node, self.raw_bits, self.raw_value
+        for byte in data:
+            for bit in BYTE_BITS[byte]:
+                if self.done:
+                    break
+                if raw_bits:
+                    raw_value = raw_value << 1 | bit
+                    raw_bits -= 1
+                    if raw_bits:
+                        continue
+                    symbol = raw_value
+                else:
+                    node = right[node] if bit else left[node]
+                    if left[node] != NO_NODE:
+                        continue
+                    symbol = symbols[node]
+                    if symbol == NYT:
+                        raw_bits, raw_value = INDEX_BITS, 0
+                        continue
+                if symbol == END:
+                    self.done = True
+                elif symbol >= END:
+                    raise ValueError("Flux adaptiv invalid")
+                else:
+                    out.append(ALPHABET[symbol])
+                    self.update(symbol)
+                node = self.root
+        self.node, self.raw_bits, self.raw_value = node, raw_bits, raw_value
+        return "".join(out)
+
+
+def adaptive_encode(text) -> bytes:
+    encoder = AdaptiveHuffmanEncoder()
+    return encoder.encode(text) + encoder.finish()
+
+
+def adaptive_decode(data) -> str:
+    decoder = AdaptiveHuffmanDecoder()
+    letters = decoder.decode(data)
+    if not decoder.done:
+        raise ValueError("Flux adaptiv trunchiat")
+    return letters
+
+
+def static_huffman(counts) -> BuildCompression:
+    """The two-pass code: Huffman built from the complete counts."""
+    return BuildCompression(counts, sorted(counts.items(), key=lambda x: x[1], reverse=True))
+
+
+def comparison(counts, encoder, static_seconds=None, compression=None) -> dict:
+    """Static canonical Huffman from `counts` vs. a finished `encoder` that saw the same letters.
+
+    The static size is computed from the code lengths (table + header + codes); its MB/s
+    is None when it was not timed, e.g. for stdin, which cannot be read twice.
+    """
+    lengths = (compression or static_huffman(counts)).canonical_coder.lengths
+    letters = counts.total()
+    static_bits = sum(count * lengths[letter] for letter, count in counts.items())
+    mb_s = lambda seconds: encoder.input_bytes / seconds / 2**20 if seconds else None
+    return {
+        "letters": letters,
+        "input_bytes": encoder.input_bytes,
+        "static_huffman": {
+            "bits_per_letter": static_bits / letters if letters else 0.0,
+            "bytes": len(ALPHABET) + HEADER.size + (static_bits + 7) // 8,
+            "mb_s": mb_s(static_seconds),
+        },
+        "adaptive_huffman": {
+            "bits_per_letter": encoder.bits_per_letter(),       ## include și simbolul END
+            "bytes": (encoder.bits + 7) // 8,
+            "mb_s": mb_s(encoder.seconds),
+        },
+    }
+
+
+def compare_file(file_path, counts, encoding="utf-8", chunk_size=CHUNK_SIZE) -> dict:
+    """comparison() with both coders run over the file, chunk by chunk, and timed."""
+    compression = static_huffman(counts)
+    encoder = AdaptiveHuffmanEncoder()
+    decoder = codecs.getincrementaldecoder(encoding)()
+    static_seconds = 0.0
+    with open(file_path, "rb") as file:
+        while True:
+            data = file.read(chunk_size)
+            text = decoder.decode(data, final=not data)
+            started = time.perf_counter()
+            compression.encode(text)
+            static_seconds += time.perf_counter() - started
+            encoder.encode(text)
+            if not data:
+                break
+    encoder.finish()
+    return comparison(counts, encoder, static_seconds, compression)
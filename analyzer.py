@@ -0,0 +1,214 @@
+"""Headless letter frequency analysis, without Tkinter or matplotlib.
+
+    python -m analyzer text.txt "corpus/*.txt" - --format csv
+    python -m analyzer --corpus documents/ "more/**/*.txt"
+    python -m analyzer big.txt --instrument --profile cprofile
+    cat big.txt | python -m analyzer - --adaptive
+"""
+import argparse, csv, glob, io, json, os, sys
+from collections import Counter
+from adaptive import AdaptiveHuffmanEncoder, compare_file, comparison
+from cache import CACHE_DIR, MAX_CACHE_BYTES, ResultCache, analysis_variant, pack_analysis, unpack_analysis
+from compression import BuildCompression
+from corpus import Corpus, corpus_files, index_path
+from frequency import CHUNK_SIZE, ROMANIAN_ALPHABET, count_letters_parallel, count_text
+from instrument import PROFILE_MODES, STATS
+from ngrams import NgramCounter, coding_comparison, count_ngrams
+
+STDIN = "-"
+
+
+def count_stream(stream, chunk_size=CHUNK_SIZE, ngrams=None, coder=None) -> Counter:
+    """Counts the letters of an already opened text stream (e.g. stdin).
+
+    On the way it feeds `ngrams` and the adaptive `coder` (whose output is discarded).
+    """
+    counts = Counter()
+    while chunk := stream.read(chunk_size):
+        count_text(chunk, counts)
+        if ngrams:
+            ngrams.add_text(chunk)
+        if coder:
+            coder.encode(chunk)
+    if coder:
+        coder.finish()
+    return counts
+
+
+def expand_inputs(patterns) -> list[str]:
+    """Expands globs; plain paths and "-" (stdin) are kept as they are."""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if pattern != STDIN and glob.has_magic(pattern) else []
+        paths.extend(matches or [pattern])
+    return paths
+
+
+def sort_counts(counts) -> list[tuple[str, int]]:
+    with STATS.timer("sort"):
+        return sorted(counts.items(), key=lambda x: x[1], reverse=True)
+
+
+def summarize(counts, max_code_length=None, compression=None) -> dict:
+    """Counts, probabilities, missing letters and the code tables, ready for JSON.
+
+    `compression` is built from the counts unless one (e.g. from the cache) is given.
+    """
+    total = counts.total()
+    sorted_counts = sort_counts(counts)
+    if compression is None and counts:
+        compression = BuildCompression(counts, sorted_counts, max_code_length)
+    return {
+        "total": total,
+        "counts": dict(sorted_counts),
+        "probabilities": {letter: count / total for letter, count in sorted_counts},
+        "missing": sorted(set(ROMANIAN_ALPHABET) - counts.keys()),
+        "huffman": compression.results_huffman if compression else {},
+        "shannon_fano": compression.results_shannon if compression else {},
+        "canonical": compression.results_canonical if compression else {},
+        "length_limit": compression.length_limit_cost() if compression else None,
+        "coders": compression.coder_comparison() if compression else None,
+    }
+
+
+def with_ngrams(report, ngrams) -> dict:
+    """Adds the coding comparison over n-gram symbols (JSON keys are strings)."""
+    if ngrams:
+        report["ngrams"] = {str(n): stats for n, stats in coding_comparison(ngrams).items()}
+    return report
+
+
+def analyze(path, workers=None, encoding="utf-8", max_code_length=None, cache=None, orders=(), adaptive=False) -> dict:
+    """Report for one input; files are looked up in `cache` (a ResultCache) first, stdin never is.
+
+    For every n in `orders` the report also compares codes built over n-grams. With
+    `adaptive`, single-pass adaptive Huffman is compared with static Huffman; stdin is
+    coded while it is counted, so there the static MB/s is not measured.
+    """
+    if path == STDIN:
+        ngrams = NgramCounter(orders) if orders else None
+        coder = AdaptiveHuffmanEncoder() if adaptive else None
+        counts = count_stream(io.TextIOWrapper(sys.stdin.buffer, encoding=encoding), ngrams=ngrams, coder=coder)
+        report = with_ngrams({"source": path, **summarize(counts, max_code_length)}, ngrams.tables if ngrams else {})
+        if coder:
+            report["adaptive"] = comparison(counts, coder)
+        return report
+    report = analyze_file(path, workers, encoding, max_code_length, cache)
+    if adaptive:
+        report["adaptive"] = compare_file(path, Counter(report["counts"]), encoding)
+    return with_ngrams(report, count_ngrams(path, orders, encoding=encoding) if orders else {})
+
+
+def analyze_file(path, workers=None, encoding="utf-8", max_code_length=None, cache=None) -> dict:
+    """Report for one file, from `cache` when its content was analysed before."""
+    if cache is None:
+        counts = count_letters_parallel(path, workers, encoding=encoding)
+        return {"source": path, **summarize(counts, max_code_length)}
+
+    def compute(path):
+        counts = count_letters_parallel(path, workers, encoding=encoding)
+        sorted_counts = sort_counts(counts)
+        compression = BuildCompression(counts, sorted_counts, max_code_length) if counts else None
+        return pack_analysis(counts, sorted_counts, compression)
+
+    entry = cache.get(path, compute, variant=analysis_variant(encoding, max_code_length))
+    counts, _, compression = unpack_analysis(entry)
+    return {"source": path, **summarize(counts, max_code_length, compression)}
+
+
+def analyze_corpus(sources, workers=None, encoding="utf-8", max_code_length=None, cache=None) -> dict:
+    """One merged report for every file under `sources`, plus the per-file counts.
+
+    With a cache, the per-file breakdown is kept next to it and unchanged files are not recounted.
+    """
+    paths = [path for source in sources for path in corpus_files(source)]
+    saved = index_path(sources, cache.directory) if cache else None
+    corpus = Corpus.load(saved, encoding) if saved else Corpus(encoding)
+    corpus.update(paths, workers)
+    if saved:
+        corpus.save(saved)
+    report = {"source": ", ".join(sources), **summarize(corpus.counts, max_code_length)}
+    report["files"] = {path: dict(corpus.breakdown(path)) for path in paths}
+    return report
+
+
+def write_json(reports, out):
+    json.dump(reports, out, ensure_ascii=False, indent=2)
+    out.write("\n")
+
+
+def write_csv(reports, out):
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["source", "letter", "count", "probability", "huffman", "shannon_fano", "canonical"])
+    for report in reports:
+        for letter in ROMANIAN_ALPHABET:
+            writer.writerow([
+                report["source"], letter, report["counts"].get(letter, 0),
+                report["probabilities"].get(letter, 0.0),
+                report["huffman"].get(letter, ""), report["shannon_fano"].get(letter, ""),
+                report["canonical"].get(letter, ""),
+            ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m analyzer", description="Frecvența literelor din alfabetul român.")
+    parser.add_argument("inputs", nargs="+", help='fișiere, globuri sau "-" pentru stdin')
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--workers", type=int, default=None, help="procese pentru numărare (implicit toate nucleele)")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--max-code-length", type=int, default=None,
+                        help="limitează codurile canonice (package-merge) și raportează costul")
+    parser.add_argument("-o", "--output", help="fișierul rezultat (implicit stdout)")
+    parser.add_argument("--ngrams", type=int, nargs="+", default=[], choices=range(1, 5), metavar="N",
+                        help="compară și coduri construite peste n-grame (ex. --ngrams 2 3)")
+    parser.add_argument("--corpus", action="store_true",
+                        help="intrările (directoare sau globuri) formează un singur corpus cu un raport comun")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="compară Huffman adaptiv (o singură trecere) cu Huffman static: biți/literă și MB/s")
+    parser.add_argument("--no-cache", action="store_true", help="numără din nou chiar dacă fișierul a mai fost analizat")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--cache-size", type=int, default=MAX_CACHE_BYTES >> 20, help="MB păstrați în cache")
+    parser.add_argument("--cache-stats", action="store_true", help="afișează hit/miss pe stderr")
+    parser.add_argument("--instrument", action="store_true",
+                        help="timpi și contoare pe etape (read, decode, count, sort, huffman, shannon) pe stderr")
+    parser.add_argument("--profile", choices=PROFILE_MODES, help="captură cProfile sau tracemalloc, pe stderr")
+    args = parser.parse_args(argv)
+    shortest = (len(ROMANIAN_ALPHABET) - 1).bit_length()       ## 2**5 >= 31 litere
+    if args.max_code_length is not None and args.max_code_length < shortest:
+        parser.error(f"--max-code-length trebuie să fie cel puțin {shortest}: "
+                     f"{len(ROMANIAN_ALPHABET)} litere nu încap în coduri mai scurte")
+    if args.corpus and (args.ngrams or args.adaptive):
+        ## corpusul reține doar literele numărate per fișier; n-gramele și codarea adaptivă ar reciti totul
+        parser.error("--corpus nu se poate combina cu --ngrams sau --adaptive")
+    if args.corpus:
+        missing = [source for source in args.inputs if not corpus_files(source)]
+    else:
+        paths = expand_inputs(args.inputs)
+        ## un glob fără potriviri rămâne ca atare, deci ajunge tot aici
+        missing = [path for path in paths if path != STDIN and not os.path.isfile(path)]
+    if missing:
+        parser.error("niciun fișier pentru: " + ", ".join(missing))
+
+    STATS.enable(args.instrument)
+    cache = None if args.no_cache else ResultCache(args.cache_dir, args.cache_size << 20)
+    with STATS.capture(args.profile):
+        if args.corpus:
+            reports = [analyze_corpus(args.inputs, args.workers, args.encoding, args.max_code_length, cache)]
+        else:
+            reports = [analyze(path, args.workers, args.encoding, args.max_code_length, cache, args.ngrams,
+                               args.adaptive) for path in paths]
+    if cache and args.cache_stats:
+        print(json.dumps({"cache": cache.stats()}), file=sys.stderr)
+    if args.instrument or args.profile:
+        print(json.dumps({"instrumentation": STATS.snapshot()}), file=sys.stderr)
+
+    writer = write_json if args.format == "json" else write_csv
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as out:
+            writer(reports, out)
+    else:
+        writer(reports, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Frame times of InteractiveChart animations with a few hundred bars (needs a display).
+
+    python benchmarks/bench_chart.py [bars]             (implicit 300)
+"""
+import os, random, sys, tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from chart import InteractiveChart
+
+
+def data(bars, seed):
+    rng = random.Random(seed)
+    return [(f"s{i}", rng.randint(1, 10_000)) for i in range(bars)]
+
+
+if __name__ == "__main__":
+    bars = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    root = tk.Tk()
+    root.geometry("1200x500")
+    chart = InteractiveChart(root)
+    chart.draw_chart(data(bars, 0))
+
+    runs = [
+        ("sortare", sorted(data(bars, 0), key=lambda x: x[1])),
+        ("date noi", data(bars, 1)),
+        ("mai multe bare", data(bars + bars // 2, 2)),
+        ("mai putine bare", data(bars // 2, 3)),
+    ]
+
+    def run(i=0):
+        if i == len(runs):
+            root.destroy()
+            return
+        name, counts = runs[i]
+
+        def report():
+            stats = chart.frame_stats()
+            print(f"{name:16s} p50 {stats['p50_ms']:6.2f} ms  p95 {stats['p95_ms']:6.2f} ms  "
+                  f"max {stats['max_ms']:6.2f} ms  ({stats['fps']:.0f} fps)")
+            root.after(100, lambda: run(i + 1))
+
+        chart.update_chart_smooth(counts, steps=30, delay=1, on_complete=report)
+
+    root.after(200, run)
+    root.mainloop()
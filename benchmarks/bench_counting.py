@@ -0,0 +1,56 @@
+"""Chars/second of the letter counting kernel vs. the old list comprehension.
+
+    python benchmarks/bench_counting.py [size_mb]       (implicit 1024 MB)
+"""
+import os, sys, tempfile, time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from frequency import ALPHABET, CHUNK_SIZE, count_text
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "text.txt")
+
+
+def comprehension(text, counts):
+    """Vechiul kernel din process_file, aplicat pe bucăți ca să încapă în memorie."""
+    counts.update(Counter([c.lower() for c in text if c.lower() in ALPHABET]))
+    return counts
+
+
+def scaled_corpus(size_mb):
+    """Writes text.txt repeated up to `size_mb` megabytes into a temporary file."""
+    with open(SAMPLE, "r", encoding="utf-8") as file:
+        sample = file.read()
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    target = size_mb << 20
+    with os.fdopen(fd, "w", encoding="utf-8") as out:
+        written = 0
+        while written < target:
+            written += out.write(sample)
+    return path
+
+
+def measure(kernel, path):
+    counts, chars = Counter(), 0
+    start = time.perf_counter()
+    with open(path, "r", encoding="utf-8") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            chars += len(chunk)
+            kernel(chunk, counts)
+    return chars / (time.perf_counter() - start), counts
+
+
+if __name__ == "__main__":
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    path = scaled_corpus(size_mb)
+    try:
+        old_rate, old_counts = measure(comprehension, path)
+        new_rate, new_counts = measure(count_text, path)
+    finally:
+        os.remove(path)
+
+    assert old_counts == new_counts, "kernelul nu dă aceleași rezultate"
+    print(f"fisier:        {size_mb} MB")
+    print(f"comprehension: {old_rate / 1e6:8.2f} M caractere/s")
+    print(f"count_text:    {new_rate / 1e6:8.2f} M caractere/s")
+    print(f"castig:        {new_rate / old_rate:8.2f}x")
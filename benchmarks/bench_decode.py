@@ -0,0 +1,43 @@
+"""Decode throughput: canonical lookup-table decoder vs. bit-by-bit tree walking.
+
+    python benchmarks/bench_decode.py [repeat]          (implicit 100 x text.txt)
+"""
+import os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, ROOT)
+from compression import BuildCompression, CanonicalHuffmanCoder
+from frequency import count_text
+
+
+def timed(decode, data):
+    start = time.perf_counter()
+    letters = decode(data)
+    return letters, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with open(os.path.join(ROOT, "text.txt"), "r", encoding="utf-8") as file:
+        text = file.read() * repeat
+
+    counts = count_text(text)
+    compression = BuildCompression(counts, sorted(counts.items(), key=lambda x: x[1], reverse=True))
+    tree_stream = compression.huffman_coder.encode(text)
+    canonical_stream = compression.encode(text)
+
+    start = time.perf_counter()
+    table_coder = CanonicalHuffmanCoder.from_stream(canonical_stream)
+    table_coder.decode(table_coder.encode(text[:100]))          ## construiește tabela
+    build_time = time.perf_counter() - start
+
+    tree_letters, tree_time = timed(compression.huffman_coder.decode, tree_stream)
+    table_letters, table_time = timed(table_coder.decode, canonical_stream)
+    assert tree_letters == table_letters, "decodoarele nu dau același text"
+
+    letters = len(table_letters)
+    print(f"litere:          {letters}")
+    print(f"arbore (bit):    {letters / tree_time / 1e6:8.2f} M litere/s")
+    print(f"tabela ({CanonicalHuffmanCoder.TABLE_BITS} biti): {letters / table_time / 1e6:8.2f} M litere/s")
+    print(f"castig:          {tree_time / table_time:8.2f}x")
+    print(f"constructie:     {build_time * 1000:8.1f} ms")
@@ -0,0 +1,36 @@
+"""Huffman round-trip on text.txt: encode/decode throughput and bits per letter.
+
+    python benchmarks/bench_huffman.py [repeat]         (implicit 100 x text.txt)
+"""
+import os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, ROOT)
+from compression import BuildCompression, entropy
+from frequency import count_text, letters_only
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with open(os.path.join(ROOT, "text.txt"), "r", encoding="utf-8") as file:
+        text = file.read() * repeat
+    data = text.encode()
+
+    counts = count_text(text)
+    compression = BuildCompression(counts, sorted(counts.items(), key=lambda x: x[1], reverse=True))
+
+    start = time.perf_counter()
+    encoded = compression.encode(data)
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decoded = compression.decode(encoded)
+    decode_time = time.perf_counter() - start
+
+    assert decoded == letters_only(text), "decodarea nu reproduce literele textului"
+    print(f"intrare:        {len(data) / 2**20:8.2f} MB, {counts.total()} litere")
+    print(f"comprimat:      {len(encoded) / 2**20:8.2f} MB")
+    print(f"codare:         {len(data) / encode_time / 2**20:8.2f} MB/s")
+    print(f"decodare:       {len(data) / decode_time / 2**20:8.2f} MB/s")
+    print(f"biti/litera:    {compression.canonical_coder.bits_per_letter(encoded):8.4f}")
+    print(f"entropie:       {entropy(counts):8.4f}")
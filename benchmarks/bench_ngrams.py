@@ -0,0 +1,46 @@
+"""N-gram counting: dense arrays fed by word casts vs. a Counter over string slices.
+
+    python benchmarks/bench_ngrams.py [size_mb]         (implicit 64 MB)
+"""
+import os, sys, time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+from bench_counting import scaled_corpus
+from frequency import letters_only
+from ngrams import coding_comparison, count_ngrams
+
+ORDERS = (2, 3)
+
+
+def sliced(path, orders):
+    """Calea naivă: tot textul în memorie, un Counter de felii pentru fiecare n."""
+    with open(path, "r", encoding="utf-8") as file:
+        letters = letters_only(file.read())
+    return {n: Counter(letters[i:i + n] for i in range(len(letters) - n + 1)) for n in orders}
+
+
+if __name__ == "__main__":
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    path = scaled_corpus(size_mb)
+    try:
+        start = time.perf_counter()
+        dense = count_ngrams(path, ORDERS)
+        dense_time = time.perf_counter() - start
+        start = time.perf_counter()
+        naive = sliced(path, ORDERS)
+        naive_time = time.perf_counter() - start
+    finally:
+        os.remove(path)
+
+    for n in ORDERS:
+        assert dict(dense[n].symbols()) == naive[n], f"{n}-gramele diferă"
+    print(f"fisier:          {size_mb} MB, n = {', '.join(map(str, ORDERS))}")
+    print(f"tablouri dense:  {size_mb / dense_time:8.2f} MB/s")
+    print(f"Counter(felii):  {size_mb / naive_time:8.2f} MB/s")
+    print(f"castig:          {naive_time / dense_time:8.2f}x")
+    for n, stats in coding_comparison(dense).items():
+        print(f"{n}-grame: {stats['symbols']:6} simboluri, Huffman {stats['huffman_bits_per_letter']:.4f}"
+              f" biti/litera, entropie {stats['entropy_bits_per_letter']:.4f}")
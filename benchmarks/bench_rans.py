@@ -0,0 +1,39 @@
+"""rANS vs. canonical Huffman on text.txt: bits per letter against the entropy, and MB/s.
+
+rANS is run with 1 and with STREAMS interleaved states.
+
+    python benchmarks/bench_rans.py [repeat]            (implicit 100 x text.txt)
+"""
+import os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, ROOT)
+from compression import BuildCompression, entropy
+from frequency import count_text, letters_only
+from rans import STREAMS, RansCoder
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with open(os.path.join(ROOT, "text.txt"), "r", encoding="utf-8") as file:
+        text = file.read() * repeat
+    data = text.encode()
+    counts = count_text(text)
+    compression = BuildCompression(counts, sorted(counts.items(), key=lambda x: x[1], reverse=True))
+    letters = letters_only(text)
+
+    print(f"intrare:   {len(data) / 2**20:8.2f} MB, {counts.total()} litere, entropie {entropy(counts):.4f} biți/literă")
+    coders = [("Huffman", compression.canonical_coder)]
+    coders += [(f"rANS x{streams}", RansCoder(compression.rans_coder.freqs, streams)) for streams in (1, STREAMS)]
+    for name, coder in coders:
+        encoded, encode_time = timed(coder.encode, data)
+        decoded, decode_time = timed(coder.decode, encoded)
+        assert decoded == letters, f"{name}: decodarea nu reproduce literele textului"
+        print(f"{name:10s} {coder.bits_per_letter(encoded):8.4f} biți/literă   codare {len(data) / encode_time / 2**20:7.2f} MB/s"
+              f"   decodare {len(data) / decode_time / 2**20:7.2f} MB/s")
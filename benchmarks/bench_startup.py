@@ -0,0 +1,49 @@
+"""Time from interpreter start to the first drawn frame of the app window (needs a display).
+
+Every run is a fresh interpreter, so imports are really cold for Python (not for the OS
+page cache). "eager" imports chart (and matplotlib) before creating the window, the way
+the app used to; "lazy" is the current startup, where they load with the results screen.
+
+    python benchmarks/bench_startup.py [runs]           (implicit 5)
+"""
+import os, statistics, subprocess, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+## rulează într-un proces nou și se oprește imediat după primul cadru
+CHILD = """
+import sys
+sys.path.insert(0, {root!r})
+if {eager}:
+    import chart
+from {module} import LetterCounterApp
+app = LetterCounterApp()
+app.update()
+app.destroy()
+"""
+
+
+def first_frame(module, eager):
+    """Seconds until `module`'s window has drawn its first frame, in a fresh interpreter."""
+    code = CHILD.format(root=ROOT, module=module, eager=eager)
+    started = time.perf_counter()
+    done = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if done.returncode:
+        raise RuntimeError(done.stderr.strip().splitlines()[-1])
+    return elapsed
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    if sys.platform != "win32" and not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+        raise SystemExit("bench_startup: nu există display (DISPLAY nu e setat)")
+    for module in ("main", "main2"):
+        for eager in (True, False):
+            try:
+                times = [first_frame(module, eager) for _ in range(runs)]
+            except RuntimeError as error:
+                print(f"{module:6s} {'eager' if eager else 'lazy':5s}  eșuat: {error}")
+                continue
+            print(f"{module:6s} {'eager' if eager else 'lazy':5s}  median {statistics.median(times) * 1000:7.1f} ms"
+                  f"  min {min(times) * 1000:7.1f} ms")
@@ -0,0 +1,76 @@
+"""Tree building and layout on huge alphabets and degenerate (very deep) trees.
+
+Times the iterative code walk, Shannon–Fano split and tree layout against the baseline
+recursive code, and the array-backed two-queue Huffman build against the baseline heap
+of Node objects. Past the recursion limit the baseline is only reported as failing.
+TreeLayout also builds the row and edge indexes used for culling, which the baseline
+draw_tree did not have.
+That the results are the same is checked by check_trees.py, not here.
+
+    python benchmarks/bench_trees.py [symbols] [depth]      (implicit 100000 20000)
+"""
+import gc, os, random, sys, time, tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+from check_trees import baseline_huffman, baseline_huffman_codes, baseline_positions, baseline_shannon_fano, to_nodes
+from compression import huffman_tree, shannon_fano
+from treelayout import TreeLayout
+
+
+def timed(function, *args):
+    gc.collect()                ## altfel o colectare generațională cade aleator pe una din variante
+    start = time.perf_counter()
+    try:
+        function(*args)
+    except RecursionError:
+        return None             ## doar versiunile recursive ajung aici
+    return time.perf_counter() - start
+
+
+def traced(function, *args) -> float:
+    """Peak traced memory of function(*args) in MB."""
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def report(name, new_time, old_time):
+    old = "RecursionError" if old_time is None else f"{old_time * 1000:9.1f} ms"
+    print(f"  {name:14} iterativ {new_time * 1000:9.1f} ms   inițial {old:>14}")
+
+
+def compare_huffman(symbols):
+    """Array two-queue build vs. the baseline Node heap: time and peak memory."""
+    new_time, old_time = timed(huffman_tree, symbols), timed(baseline_huffman, symbols)
+    new_memory, old_memory = traced(huffman_tree, symbols), traced(baseline_huffman, symbols)
+    print(f"  {'arbore Huffman':14} tablouri {new_time * 1000:9.1f} ms {new_memory:6.1f} MB"
+          f"   heap de Node {old_time * 1000:9.1f} ms {old_memory:6.1f} MB")
+
+
+def run_case(title, symbols, tree):
+    print(f"{title}: {len(symbols)} simboluri, adâncime {max(tree.code_lengths().values())}")
+    root = to_nodes(tree)[tree.root]        ## convertit înainte, ca să nu intre în timpul versiunii inițiale
+    report("coduri", timed(tree.codes), timed(baseline_huffman_codes, root))
+    ordered = sorted(symbols, key=lambda x: (-x[1], x[0]))
+    report("Shannon–Fano", timed(shannon_fano, symbols), timed(baseline_shannon_fano, ordered))
+    report("layout arbore", timed(TreeLayout, tree), timed(baseline_positions, root))
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    rng = random.Random(1)
+
+    symbols = [(f"s{i}", rng.randint(1, 1_000_000)) for i in range(size)]
+    run_case("alfabet mare", symbols, huffman_tree(symbols))
+    compare_huffman(symbols)
+    # puteri ale lui 2: Shannon–Fano desparte mereu câte o singură literă, deci arborele e un lanț
+    # (numărătorile depășesc 64 de biți, deci lanțul vine din Shannon–Fano, nu din Huffman)
+    for title, n in (("lanț sub limita de recursivitate", min(depth, sys.getrecursionlimit() - 100)),
+                     ("lanț adânc", depth)):
+        symbols = [(f"s{i}", 1 << i) for i in range(n)]
+        run_case(title, symbols, shannon_fano(symbols)[1])
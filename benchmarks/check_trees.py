@@ -0,0 +1,215 @@
+"""Checks the iterative tree code against the baseline recursive implementation.
+
+The references below are the Node-based code the app shipped with (BuildCompression
+and TreeCanvas.draw_tree from the first main2.py), copied as they were. Every check
+runs on the same trees:
+
+* a large random alphabet: Huffman codes, Shannon–Fano codes and tree, and the tree
+  layout must be exactly what the baseline produced; the array-based Huffman build
+  must give the same total code length as the baseline heap of Node objects;
+* a chain just under the recursion limit: the same Shannon–Fano and layout checks
+  (its counts do not fit the 64-bit Huffman counters);
+* a chain far past the recursion limit: the baseline must raise RecursionError, and
+  the iterative code must finish with consistent codes and layout.
+
+    python benchmarks/check_trees.py [symbols] [depth]      (implicit 100000 20000)
+
+Exits with an error message on the first failed check.
+"""
+import heapq, os, random, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, ROOT)
+from compression import NO_NODE, huffman_tree, shannon_fano
+from treelayout import TreeLayout
+
+
+# ---- implementarea inițială (main2.py din baseline), doar ca referință ----
+class Node:
+    def __init__(self, symbol=None, freq=0, left=None, right=None):
+        self.symbol = symbol
+        self.freq = freq
+        self.left = left
+        self.right = right
+
+    def __lt__(self, other):
+        return self.freq < other.freq
+
+
+def baseline_huffman(symbols):
+    """BuildCompression.build_huffman: heap of Node objects."""
+    heap = [Node(c, f) for c, f in symbols]
+    heapq.heapify(heap)
+    while len(heap) > 1:
+        left = heapq.heappop(heap)
+        right = heapq.heappop(heap)
+        heapq.heappush(heap, Node(None, left.freq + right.freq, left, right))
+    return heap[0] if heap else None
+
+
+def baseline_huffman_codes(root):
+    """BuildCompression._build_huffman_codes; the baseline kept int(prefix), which drops leading zeros."""
+    codes = {}
+
+    def build(node, prefix):
+        if node is None: return
+        if node.symbol is not None:
+            codes[node.symbol] = prefix or "0"
+            return
+        build(node.left, prefix + "0")
+        build(node.right, prefix + "1")
+
+    build(root, "")
+    return codes
+
+
+def baseline_shannon_fano(symbols):
+    """BuildCompression.build_shannon_fano / _recursive_shannon."""
+    total = sum(f for _, f in symbols)
+    probs = [(c, f/total) for c, f in symbols]
+    codes = {}
+
+    def recursive_shannon(symbols, prefix=""):
+        if len(symbols) == 1:
+            codes[symbols[0][0]] = prefix or "0"
+            return Node(symbols[0][0], round(symbols[0][1], 2))
+        total = sum(p for _, p in symbols)
+        acc, split = 0, 0
+        for i, (_, p) in enumerate(symbols):
+            acc += p
+            if acc >= total/2:
+                split = i+1
+                break
+        left_node = recursive_shannon(symbols[:split], prefix+"0")
+        right_node = recursive_shannon(symbols[split:], prefix+"1")
+        return Node(None, round(total, 2), left_node, right_node)
+
+    return codes, recursive_shannon(probs)
+
+
+def baseline_positions(root):
+    """TreeCanvas.draw_tree up to the drawing: leaf-order positions, then the margin."""
+    positions = {}
+    x_step = 60
+    y_step = 80
+    def assign_x(node, depth, next_x):
+        if node is None: return next_x
+        if node.left is None and node.right is None:
+            positions[node] = (next_x * x_step, depth * y_step)
+            return next_x + 1
+        next_x = assign_x(node.left, depth + 1, next_x)
+        next_x = assign_x(node.right, depth + 1, next_x)
+        lx, _ = positions[node.left]
+        rx, _ = positions[node.right]
+        positions[node] = ((lx + rx)/2, depth * y_step)
+        return next_x
+
+    assign_x(root, 0, 1)
+
+    # Normalize margin
+    min_x = min(pos[0] for pos in positions.values())
+    for node in positions:
+        x, y = positions[node]
+        positions[node] = (x - min_x + 50, y + 30)
+    return positions
+
+
+# ---- comparații ----
+def to_nodes(tree) -> list[Node]:
+    """The Node objects of a CodeTree, indexed by node id (built without recursion)."""
+    nodes = [Node(symbol, freq) for symbol, freq in zip(tree.symbols, tree.freq)]
+    for node, left, right in zip(nodes, tree.left, tree.right):
+        if left != NO_NODE:
+            node.left, node.right = nodes[left], nodes[right]
+    return nodes
+
+
+def same_nodes(a, b) -> bool:
+    """Same shape, symbols and weights, compared with an explicit stack."""
+    stack = [(a, b)]
+    while stack:
+        a, b = stack.pop()
+        if (a is None) != (b is None):
+            return False
+        if a is not None:
+            if (a.symbol, a.freq) != (b.symbol, b.freq):
+                return False
+            stack.extend(((a.left, b.left), (a.right, b.right)))
+    return True
+
+
+def baseline(function, *args):
+    """function(*args), or None when the recursive baseline hits the recursion limit."""
+    try:
+        return function(*args)
+    except RecursionError:
+        return None
+
+
+def check(name, ok):
+    print(f"  {name:34} {'ok' if ok else 'DIFERIT'}")
+    if not ok:
+        raise SystemExit(f"{name}: rezultatul diferă de implementarea inițială")
+
+
+def check_same(title, symbols):
+    """Every result equal to the baseline; the baseline must stay within the recursion limit."""
+    sf_codes, sf_tree = shannon_fano(symbols)
+    print(f"{title}: {len(symbols)} simboluri, adâncime Shannon–Fano {max(sf_tree.code_lengths().values())}")
+
+    if sum(f for _, f in symbols) < 1 << 63:       ## CodeTree ține numărătorile Huffman pe 64 de biți
+        # arborele Huffman diferă la egalități (heap vs. două cozi): se compară costul total
+        tree = huffman_tree(symbols)
+        weights = dict(symbols)
+        cost = lambda lengths: sum(weights[s] * length for s, length in lengths.items())
+        expected = baseline_huffman_codes(baseline_huffman(symbols))
+        check("Huffman: lungime totală", cost(tree.code_lengths()) == cost({s: len(c) for s, c in expected.items()}))
+        nodes = to_nodes(tree)
+        check("Huffman: coduri pe același arbore",
+              list(tree.codes().items()) == list(baseline_huffman_codes(nodes[tree.root]).items()))
+        positions = baseline_positions(nodes[tree.root])
+        check("Huffman: poziții layout", TreeLayout(tree).positions == [positions[node] for node in nodes])
+
+    # aplicația dă simbolurile sortate descrescător; shannon_fano le sortează singur (egalități după simbol)
+    expected_codes, expected_root = baseline_shannon_fano(sorted(symbols, key=lambda x: (-x[1], x[0])))
+    check("Shannon–Fano: coduri", list(sf_codes.items()) == list(expected_codes.items()))
+    nodes = to_nodes(sf_tree)
+    check("Shannon–Fano: arbore", same_nodes(nodes[sf_tree.root], expected_root))
+    positions = baseline_positions(nodes[sf_tree.root])
+    check("Shannon–Fano: poziții layout", TreeLayout(sf_tree).positions == [positions[node] for node in nodes])
+
+
+def check_deep(title, symbols):
+    """Past the recursion limit: the baseline fails, the iterative code gives a consistent result."""
+    codes, tree = shannon_fano(symbols)
+    print(f"{title}: {len(symbols)} simboluri, limita de recursivitate {sys.getrecursionlimit()}")
+    nodes = to_nodes(tree)
+    check("inițial: RecursionError", all(result is None for result in (
+        baseline(baseline_shannon_fano, sorted(symbols, key=lambda x: (-x[1], x[0]))),
+        baseline(baseline_huffman_codes, nodes[tree.root]),
+        baseline(baseline_positions, nodes[tree.root]))))
+
+    lengths = tree.code_lengths()
+    check("coduri: lungime = adâncime", {s: len(c) for s, c in codes.items()} == lengths
+          and tree.codes() == codes and max(lengths.values()) == len(symbols) - 1)
+    ordered = sorted(codes.values())
+    check("coduri: fără prefix comun", all(not b.startswith(a) for a, b in zip(ordered, ordered[1:])))
+    layout = TreeLayout(tree)
+    check("layout: toate nodurile, pe nivele", None not in layout.positions and len(layout.rows) == len(symbols)
+          and layout.leaves[tree.root] == len(symbols)
+          and all(layout.positions[child][1] - layout.positions[node][1] == 80
+                  for node in range(len(tree)) for child in (tree.left[node], tree.right[node]) if child != NO_NODE))
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    rng = random.Random(1)
+
+    check_same("alfabet mare", [(f"s{i}", rng.randint(1, 1_000_000)) for i in range(size)])
+    # puteri ale lui 2: Shannon–Fano desparte mereu câte o singură literă, deci arborele e un lanț
+    # (numărătorile depășesc 64 de biți, deci lanțul vine din Shannon–Fano, nu din Huffman)
+    shallow = min(depth, sys.getrecursionlimit() - 100)
+    check_same("lanț sub limita de recursivitate", [(f"s{i}", 1 << i) for i in range(shallow)])
+    if depth > sys.getrecursionlimit():
+        check_deep("lanț adânc", [(f"s{i}", 1 << i) for i in range(depth)])
@@ -0,0 +1,398 @@
+"""Reproducible benchmark suite: counting, code construction, encoding and rendering.
+
+Synthetic Romanian-like corpora (words drawn with the word frequencies of text.txt, with
+ă/â/î/ș/ț put back at their usual Romanian share, since text.txt is written almost without
+them) are generated once per size and seed and reused. Every
+case runs in a fresh process, so its peak RSS is its own; the results go to a JSON file.
+
+    python benchmarks/suite.py run [--sizes 1 100 1024] [--repeat 5] [--out results.json]
+    python benchmarks/suite.py compare old.json new.json [--threshold 0.1]
+
+`compare` exits with status 1 when a case got slower (p50) or bigger (peak RSS) than the
+threshold allows. Rendering cases are reported as skipped without a display or matplotlib.
+"""
+import argparse, json, os, platform, random, re, statistics, subprocess, sys, tempfile, time
+from collections import Counter
+from itertools import accumulate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, ROOT)
+from compression import BuildCompression
+from frequency import ALPHABET, count_bytes, count_letters, count_letters_parallel
+from treelayout import TreeLayout
+
+SAMPLE = os.path.join(ROOT, "text.txt")
+CORPUS_DIR = os.path.join(tempfile.gettempdir(), "letter-frequency-bench")
+CORPUS_VERSION = 2                  ## crește când se schimbă generarea, ca vechile corpusuri să fie refăcute
+SIZES = (1, 100, 1024)              ## MB
+BLOCK_WORDS = 150_000               ## ~1 MB de text per bloc generat
+SENTENCE_WORDS = 12
+ENCODE_LIMIT = 16 << 20             ## codarea Python e lentă; se măsoară pe primii 16 MB
+BUILD_CALLS = 200                   ## apeluri per măsurătoare pentru construcțiile pe 31 de litere
+LARGE_ALPHABET = 20_000
+CHART_BARS = 300
+# diacritică -> (litera scrisă în locul ei, ponderea aproximativă între literele unui text românesc)
+DIACRITICS = {"ă": ("a", 0.040), "â": ("a", 0.008), "î": ("i", 0.012), "ș": ("s", 0.014), "ț": ("t", 0.010)}
+SPELLINGS = 64                      ## variante per cuvânt; media lor dă ponderea țintă
+SHARE_TOLERANCE = 0.1               ## abatere relativă admisă față de DIACRITICS în corpusul generat
+
+
+def with_diacritics(vocabulary, rng) -> dict[str, float]:
+    """Word weights with every word spread over SPELLINGS spellings in which a/i/s/t are
+    rewritten to ă/â/î/ș/ț, with probabilities that give each diacritic its DIACRITICS share.
+    """
+    letters = Counter()
+    for word, n in vocabulary.items():
+        for char in word:
+            letters[char] += n
+    total = sum(letters[letter] for letter in ALPHABET)
+    rewrites = {}           ## litera de bază -> [(diacritică, probabilitate)]
+    for diacritic, (base, share) in DIACRITICS.items():
+        rewrites.setdefault(base, []).append((diacritic, share * total / letters[base]))
+
+    def respell(char):
+        r = rng.random()
+        for diacritic, p in rewrites.get(char, ()):
+            if r < p:
+                return diacritic
+            r -= p
+        return char
+
+    spelled = Counter()
+    for word, n in vocabulary.items():
+        for _ in range(SPELLINGS):
+            spelled["".join(map(respell, word))] += n / SPELLINGS
+    return spelled
+
+
+def check_shares(counts, path):
+    total = sum(counts.values())
+    for diacritic, (_, share) in DIACRITICS.items():
+        if abs(counts[diacritic] / total / share - 1) > SHARE_TOLERANCE:
+            raise RuntimeError(f"{path}: {diacritic} are {counts[diacritic] / total:.3%} din litere, "
+                               f"nu ~{share:.1%}")
+
+
+def synthetic_corpus(size_mb, seed=0, directory=CORPUS_DIR) -> str:
+    """Path of a `size_mb` MB corpus, generated (deterministically) the first time."""
+    path = os.path.join(directory, f"corpus-{size_mb}mb-{seed}-v{CORPUS_VERSION}.txt")
+    if os.path.exists(path):
+        return path
+    os.makedirs(directory, exist_ok=True)
+    with open(SAMPLE, "r", encoding="utf-8") as file:
+        vocabulary = Counter(re.findall(r"[^\W\d_]+", file.read().lower()))
+    rng = random.Random(seed)
+    vocabulary = with_diacritics(vocabulary, rng)
+    words = sorted(vocabulary)
+    cum_weights = list(accumulate(vocabulary[w] for w in words))
+
+    temporary = path + ".tmp"
+    target = size_mb << 20
+    counts = Counter()
+    with open(temporary, "wb") as out:
+        written = 0
+        while written < target:
+            drawn = rng.choices(words, cum_weights=cum_weights, k=BLOCK_WORDS)
+            sentences = [" ".join(drawn[i:i + SENTENCE_WORDS]).capitalize()
+                         for i in range(0, len(drawn), SENTENCE_WORDS)]
+            # un paragraf la fiecare 5 propoziții
+            block = ".\n".join(". ".join(sentences[i:i + 5]) for i in range(0, len(sentences), 5)) + ".\n"
+            data = block.encode()
+            if written + len(data) > target:
+                # ultimul bloc nu taie o literă în două; restul de octeți devine spații
+                data = data[:target - written].decode(errors="ignore").encode().ljust(target - written)
+            count_bytes(data, counts)
+            written += out.write(data)
+    try:
+        check_shares(counts, path)
+    except RuntimeError:
+        os.remove(temporary)
+        raise
+    os.replace(temporary, path)         ## un fișier existent e mereu complet
+    return path
+
+
+def large_alphabet(size=LARGE_ALPHABET, seed=1):
+    rng = random.Random(seed)
+    return sorted(((f"s{i}", rng.randint(1, 1_000_000)) for i in range(size)), key=lambda x: x[1], reverse=True)
+
+
+def letter_symbols(path):
+    counts = count_letters_parallel(path)
+    return counts, sorted(counts.items(), key=lambda x: x[1], reverse=True)
+
+
+def utf8_prefix(path, limit):
+    with open(path, "rb") as file:
+        return file.read(limit).decode("utf-8", errors="ignore").encode()
+
+
+def time_calls(function, repeat, calls=1) -> list[float]:
+    """Seconds per call, `repeat` times, after one untimed warm-up (page cache, imports)."""
+    function()
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        runs.append((time.perf_counter() - start) / calls)
+    return runs
+
+
+# ---- cazuri: fiecare întoarce (durate în secunde, octeți procesați per apel sau None) ----
+def case_count_stream(path, repeat):
+    return time_calls(lambda: count_letters(path), repeat), os.path.getsize(path)
+
+
+def case_count_parallel(path, repeat):
+    return time_calls(lambda: count_letters_parallel(path), repeat), os.path.getsize(path)
+
+
+def case_build_huffman(path, repeat):
+    counts, symbols = letter_symbols(path)
+    compression = BuildCompression(counts, symbols)
+    return time_calls(compression.build_huffman, repeat, BUILD_CALLS), None
+
+
+def case_build_shannon_fano(path, repeat):
+    counts, symbols = letter_symbols(path)
+    compression = BuildCompression(counts, symbols)
+    return time_calls(compression.build_shannon_fano, repeat, BUILD_CALLS), None
+
+
+def case_build_large_alphabet(path, repeat):
+    symbols = large_alphabet()
+    compression = BuildCompression.__new__(BuildCompression)
+    compression.symbols = symbols
+    return time_calls(lambda: (compression.build_huffman(), compression.build_shannon_fano()), repeat), None
+
+
+def case_encode(path, repeat):
+    data = utf8_prefix(path, ENCODE_LIMIT)
+    compression = BuildCompression(*letter_symbols(path))
+    return time_calls(lambda: compression.encode(data), repeat), len(data)
+
+
+def case_decode(path, repeat):
+    data = utf8_prefix(path, ENCODE_LIMIT)
+    compression = BuildCompression(*letter_symbols(path))
+    encoded = compression.encode(data)
+    return time_calls(lambda: compression.decode(encoded), repeat), len(data)
+
+
+def case_rans_encode(path, repeat):
+    data = utf8_prefix(path, ENCODE_LIMIT)
+    compression = BuildCompression(*letter_symbols(path))
+    return time_calls(lambda: compression.rans_coder.encode(data), repeat), len(data)
+
+
+def case_rans_decode(path, repeat):
+    data = utf8_prefix(path, ENCODE_LIMIT)
+    compression = BuildCompression(*letter_symbols(path))
+    encoded = compression.rans_coder.encode(data)
+    return time_calls(lambda: compression.rans_coder.decode(encoded), repeat), len(data)
+
+
+def case_tree_layout(path, repeat):
+    from compression import huffman_tree
+    tree = huffman_tree(large_alphabet())
+    return time_calls(lambda: TreeLayout(tree), repeat), None
+
+
+def case_tree_draw(path, repeat):
+    import tkinter as tk
+    from compression import huffman_tree
+    from treecanvas import TreeCanvas
+    root = tk.Tk()
+    view = TreeCanvas(root, huffman_tree(large_alphabet()))
+    view.pack(fill="both", expand=True)
+    root.update()
+
+    def draw():
+        view.draw_tree()
+        root.update()
+    try:
+        return time_calls(draw, repeat), None
+    finally:
+        root.destroy()
+
+
+def case_chart_redraw(path, repeat):
+    import tkinter as tk
+    from chart import InteractiveChart
+    root = tk.Tk()
+    chart = InteractiveChart(root)
+    rng = random.Random(0)
+    data = [[(f"s{i}", rng.randint(1, 10_000)) for i in range(CHART_BARS)] for _ in range(2)]
+    turn = [0]
+
+    def redraw():
+        turn[0] ^= 1
+        chart.draw_chart(data[turn[0]])
+        root.update()
+    try:
+        return time_calls(redraw, repeat), None
+    finally:
+        root.destroy()
+
+
+## cazurile care depind de mărimea corpusului rulează pe fiecare mărime, celelalte o dată
+PER_SIZE = {
+    "count_stream": case_count_stream,
+    "count_parallel": case_count_parallel,
+    "encode": case_encode,
+    "decode": case_decode,
+    "rans_encode": case_rans_encode,
+    "rans_decode": case_rans_decode,
+}
+ONCE = {
+    "build_huffman": case_build_huffman,
+    "build_shannon_fano": case_build_shannon_fano,
+    "build_large_alphabet": case_build_large_alphabet,
+    "tree_layout": case_tree_layout,
+    "tree_draw": case_tree_draw,
+    "chart_redraw": case_chart_redraw,
+}
+NEEDS_DISPLAY = {"tree_draw", "chart_redraw"}
+
+
+def peak_rss_mb() -> float | None:
+    """Peak RSS of this process or of its largest worker, in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024     ## octeți pe macOS, KB în rest
+
+
+def percentile(times, fraction):
+    times = sorted(times)
+    return times[min(len(times) - 1, int(len(times) * fraction))]
+
+
+def run_case(name, path, repeat) -> dict:
+    """Runs one case in this process and summarizes it."""
+    runs, processed = {**PER_SIZE, **ONCE}[name](path, repeat)
+    result = {
+        "runs_ms": [t * 1000 for t in runs],
+        "p50_ms": statistics.median(runs) * 1000,
+        "p95_ms": percentile(runs, 0.95) * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if processed:
+        result["bytes"] = processed
+        result["throughput_mb_s"] = processed / statistics.median(runs) / 2**20
+    return result
+
+
+def run_isolated(name, path, repeat) -> dict:
+    """run_case in a fresh interpreter, so peak RSS is not inherited from earlier cases."""
+    if name in NEEDS_DISPLAY and sys.platform != "win32" and not os.environ.get("DISPLAY"):
+        return {"skipped": "nu există display"}
+    done = subprocess.run([sys.executable, os.path.realpath(__file__), "case", name, path, str(repeat)],
+                          capture_output=True, text=True)
+    if done.returncode:
+        lines = done.stderr.strip().splitlines()
+        return {"skipped": lines[-1] if lines else f"cod de ieșire {done.returncode}"}
+    return json.loads(done.stdout)
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "-C", ROOT, "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def run_suite(sizes, repeat, cases=None, seed=0) -> dict:
+    results = {}
+    selected = lambda table: [name for name in table if cases is None or name in cases]
+    for size in sizes:
+        path = synthetic_corpus(size, seed)
+        for name in selected(PER_SIZE):
+            results[f"{name}@{size}MB"] = result = run_isolated(name, path, repeat)
+            report(f"{name}@{size}MB", result)
+    path = synthetic_corpus(min(sizes), seed)
+    for name in selected(ONCE):
+        results[name] = result = run_isolated(name, path, repeat)
+        report(name, result)
+    return {"environment": environment(), "sizes_mb": list(sizes), "repeat": repeat, "seed": seed, "results": results}
+
+
+def report(name, result):
+    if "skipped" in result:
+        print(f"{name:28s} omis: {result['skipped']}", file=sys.stderr)
+        return
+    rss = result["peak_rss_mb"]
+    throughput = f"{result['throughput_mb_s']:9.2f} MB/s" if "throughput_mb_s" in result else " " * 14
+    print(f"{name:28s} p50 {result['p50_ms']:10.3f} ms  p95 {result['p95_ms']:10.3f} ms  {throughput}"
+          f"  RSS {'-' if rss is None else f'{rss:.0f} MB'}", file=sys.stderr)
+
+
+def compare(old, new, threshold=0.1) -> list[str]:
+    """Cases present in both runs whose p50 or peak RSS grew by more than `threshold`."""
+    regressions = []
+    for name, after in new["results"].items():
+        before = old["results"].get(name)
+        if not before or "skipped" in before or "skipped" in after:
+            continue
+        for key in ("p50_ms", "peak_rss_mb"):
+            if before.get(key) and after.get(key) is not None:
+                change = after[key] / before[key] - 1
+                flag = "REGRESIE" if change > threshold else ""
+                print(f"{name:28s} {key:12s} {before[key]:10.3f} -> {after[key]:10.3f}  {change:+7.1%}  {flag}")
+                if flag:
+                    regressions.append(f"{name} {key}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run the suite and write the results as JSON")
+    run.add_argument("--sizes", type=int, nargs="+", default=SIZES, metavar="MB")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--cases", nargs="+", choices=[*PER_SIZE, *ONCE])
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--out", help="output file (default: stdout)")
+    diff = commands.add_parser("compare", help="flag regressions between two result files")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument("--threshold", type=float, default=0.1, help="allowed growth, 0.1 = 10%%")
+    case = commands.add_parser("case")      ## intern: un singur caz, în procesul curent
+    case.add_argument("name")
+    case.add_argument("path")
+    case.add_argument("repeat", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "case":
+        print(json.dumps(run_case(args.name, args.path, args.repeat)))
+    elif args.command == "run":
+        results = json.dumps(run_suite(args.sizes, args.repeat, args.cases, args.seed), indent=2)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as out:
+                out.write(results)
+        else:
+            print(results)
+    else:
+        with open(args.old, encoding="utf-8") as file:
+            old = json.load(file)
+        with open(args.new, encoding="utf-8") as file:
+            new = json.load(file)
+        regressions = compare(old, new, args.threshold)
+        if regressions:
+            sys.exit(f"{len(regressions)} regresii: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import hashlib, json, os
+from collections import Counter
+from compression import BuildCompression
+from instrument import STATS
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "letter-frequency")
+MAX_CACHE_BYTES = 64 << 20      ## peste această mărime intrările cele mai vechi sunt șterse
+MAX_INDEX_PATHS = 4096          ## căi reținute pentru verificarea rapidă mărime + mtime
+HASH_CHUNK = 1 << 20
+INDEX = "index.json"
+
+
+def file_digest(file_path) -> str:
+    digest = hashlib.blake2b()
+    with open(file_path, "rb") as file:
+        while chunk := file.read(HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json(path, data):
+    """Atomic write: readers (or other processes) never see half a file."""
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False)
+    os.replace(temp, path)
+
+
+class ResultCache:
+    """Analysis results on disk, keyed by the content hash of the analysed file.
+
+    A path whose size and mtime still match the index reuses its last hash, so an
+    unchanged file is not even read. Every entry is one JSON file whose mtime marks
+    its last use; past max_bytes the least recently used entries are deleted.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, INDEX)
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                self.index = json.load(file)        ## cale -> [mărime, mtime_ns, hash]
+        except (OSError, ValueError):
+            self.index = {}
+
+    def digest(self, file_path) -> str:
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        known = self.index.get(path)
+        if known and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return known[2]
+        digest = file_digest(path)
+        self.index.pop(path, None)
+        self.index[path] = [stat.st_size, stat.st_mtime_ns, digest]
+        for stale in list(self.index)[:-MAX_INDEX_PATHS]:
+            del self.index[stale]
+        _write_json(self.index_path, self.index)
+        return digest
+
+    def entry_path(self, file_path, variant="") -> str:
+        key = hashlib.blake2b(f"{self.digest(file_path)}\0{variant}".encode(), digest_size=20).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, file_path, compute, variant=""):
+        """The cached result for the content of `file_path`, or compute(file_path) stored for next time.
+
+        `variant` separates results of the same content computed with different options.
+        """
+        path = self.entry_path(file_path, variant)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                result = json.load(file)
+            os.utime(path)              ## folosită acum: ultima la evacuare
+            self.hits += 1
+            STATS.count("cache_hits")
+            return result
+        except (OSError, ValueError):
+            pass
+
+        self.misses += 1
+        STATS.count("cache_misses")
+        result = compute(file_path)
+        _write_json(path, result)
+        self.evict()
+        return result
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json") and entry.name != INDEX:
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+def analysis_variant(encoding="utf-8", max_code_length=None) -> str:
+    """Cache variant of a letter analysis; the GUI and the CLI share entries made with the same options."""
+    return f"{encoding}:{max_code_length}"
+
+
+def pack_analysis(counts, sorted_counts, compression) -> dict:
+    return {
+        "counts": dict(counts),
+        "sorted_counts": sorted_counts,
+        "compression": compression.to_dict() if compression else None,
+    }
+
+
+def unpack_analysis(entry, compression_class=BuildCompression):
+    """(counts, sorted_counts, compression) from a pack_analysis dict, without rebuilding any code."""
+    compression = compression_class.from_dict(entry["compression"]) if entry["compression"] else None
+    return Counter(entry["counts"]), [tuple(item) for item in entry["sorted_counts"]], compression
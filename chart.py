@@ -0,0 +1,207 @@
+import tkinter as tk, matplotlib.colors as mcolors, time
+from bisect import bisect_right
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from instrument import STATS
+
+BAR_COLOR = "#3a7bd5"
+HOVER_COLOR = "#5ab4ff"
+FADE_STEPS = 4          ## cadre pentru tranziția de culoare la hover
+FADE_DELAY = 16
+
+
+class InteractiveChart:
+    """Chart with smooth height animation and hover tooltip.
+
+    Animations redraw the axes once, cache them as a background and then only blit
+    the bars on every frame.
+    """
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.figure = Figure(figsize=(8, 3), dpi=100)
+        self.ax = self.figure.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.parent)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+
+        self.tooltip = tk.Label(parent, bg="#333", fg="white", padx=5, pady=2, font=("Segoe UI", 10))
+        self.tooltip.place_forget()
+
+        self.bars = []
+        self.data = []
+        self.animating = False
+        self.background = None
+        self.frame_times = []       ## durata cadrelor ultimei animații, în secunde
+        self.bar_lefts = []         ## marginea stângă a fiecărei bare, crescător, pentru bisect
+        self.hovered = None         ## indexul barei de sub mouse
+        self.fade_targets = {}      ## index bară -> culoarea spre care tranziționează acum
+
+        self.canvas.mpl_connect("motion_notify_event", self.on_hover)
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+
+    def draw_chart(self, sorted_counts):
+        """Initial chart draw."""
+        with STATS.timer("draw"):
+            self.ax.clear()
+            letters = [l for l, _ in sorted_counts]
+            counts = [c for _, c in sorted_counts]
+
+            # poziții numerice, ca animația să poată adăuga sau scoate bare
+            self.bars = list(self.ax.bar(range(len(letters)), counts, color=BAR_COLOR))
+            self.data = sorted_counts
+            self.ax.set_xticks(range(len(letters)))
+            self.ax.set_xticklabels(letters)
+
+            self.ax.set_xlabel("Litere")
+            self.ax.set_ylabel("Total")
+            self.ax.set_title("Frecventa de aparitie")
+            self.ax.grid(True, linestyle="--", alpha=0.5)
+            self.index_bars()
+            self.canvas.draw()
+
+    def on_draw(self, event):
+        """A full redraw (first frame, window resize) replaces the cached background."""
+        if self.animating:
+            self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+            self.blit_bars()
+
+    def blit_bars(self):
+        for bar in self.bars:
+            self.ax.draw_artist(bar)
+        self.canvas.blit(self.ax.bbox)
+
+    def update_chart_smooth(self, sorted_counts, steps=10, delay=30, on_complete=None):
+        if self.animating: return
+
+        if not self.bars:
+            self.draw_chart(sorted_counts)
+            if on_complete:
+                on_complete()
+            return
+
+        letters = [l for l, _ in sorted_counts]
+        new_count = len(sorted_counts)
+
+        # bare noi cresc de la 0; barele în plus coboară la 0 și sunt scoase la final
+        for x in range(len(self.bars), new_count):
+            self.bars.extend(self.ax.bar([x], [0], color=BAR_COLOR))
+        current_heights = [bar.get_height() for bar in self.bars]
+        new_heights = [c for _, c in sorted_counts] + [0] * (len(self.bars) - new_count)
+
+        self.animating = True
+        for bar in self.bars:
+            bar.set_animated(True)
+        self.ax.set_xlim(-0.5, len(self.bars) - 0.5)
+        self.ax.set_ylim(0, max(current_heights + new_heights, default=0) * 1.05 or 1)
+        self.ax.set_xticks(range(new_count))
+        self.ax.set_xticklabels(letters)
+        self.frame_times = []
+        with STATS.timer("draw"):
+            self.canvas.draw()          ## singura redesenare completă; on_draw salvează fundalul
+
+        def step(i):
+            started = time.perf_counter()
+            factor = (i + 1) / steps
+            self.canvas.restore_region(self.background)
+            for bar, h_old, h_new in zip(self.bars, current_heights, new_heights):
+                bar.set_height(h_old + (h_new - h_old) * factor)
+            self.blit_bars()
+            self.frame_times.append(time.perf_counter() - started)
+            if STATS.enabled:
+                STATS.add_time("draw", self.frame_times[-1])
+
+            if i + 1 < steps:
+                self.parent.after(delay, lambda: step(i + 1))
+            else:
+                self.finish_animation(sorted_counts)
+                if on_complete:
+                    on_complete()
+        step(0)
+
+    def finish_animation(self, sorted_counts):
+        for bar in self.bars[len(sorted_counts):]:
+            bar.remove()
+        self.bars = self.bars[:len(sorted_counts)]
+        for bar in self.bars:
+            bar.set_animated(False)
+        self.ax.set_xlim(-0.5, len(self.bars) - 0.5)
+        self.ax.set_ylim(0, max((c for _, c in sorted_counts), default=0) * 1.05 or 1)
+        self.animating = False
+        self.data = sorted_counts
+        self.index_bars()
+        self.canvas.draw_idle()
+
+    def frame_stats(self) -> dict:
+        """Frame times of the last animation in ms; 60 fps needs p95 under 16.7 ms."""
+        times = sorted(self.frame_times)
+        if not times:
+            return {}
+        return {
+            "frames": len(times),
+            "p50_ms": times[len(times) // 2] * 1000,
+            "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))] * 1000,
+            "max_ms": times[-1] * 1000,
+            "fps": 1 / times[len(times) // 2],
+        }
+
+    def index_bars(self):
+        """Rebuilds the hit-test index; bars sit at increasing x, so it stays sorted."""
+        for bar in self.bars:
+            bar.set_facecolor(BAR_COLOR)
+        self.bar_lefts = [bar.get_x() for bar in self.bars]
+        self.hovered = None
+        self.fade_targets = {}
+
+    def bar_at(self, x, y):
+        """Index of the bar under data point (x, y), in O(log n)."""
+        if x is None or y is None:
+            return None
+        i = bisect_right(self.bar_lefts, x) - 1
+        if i < 0 or i >= len(self.data):
+            return None
+        bar = self.bars[i]
+        if x <= bar.get_x() + bar.get_width() and 0 <= y <= bar.get_height():
+            return i
+        return None
+
+    def on_hover(self, event):
+        if self.animating:
+            return          ## culorile se schimbă după animație, nu peste blit
+
+        hovered = self.bar_at(event.xdata, event.ydata) if event.inaxes == self.ax else None
+        if hovered is not None:
+            letter, count = self.data[hovered]
+            self.show_tooltip(event, f"{letter}: {count}")
+        else:
+            self.tooltip.place_forget()
+
+        if hovered != self.hovered:     ## doar barele care au câștigat/pierdut hover-ul
+            if self.hovered is not None:
+                self.animate_color(self.hovered, BAR_COLOR)
+            if hovered is not None:
+                self.animate_color(hovered, HOVER_COLOR)
+            self.hovered = hovered
+
+    def show_tooltip(self, event, text):
+        self.tooltip.config(text=text)
+        x = int(self.parent.winfo_pointerx() - self.parent.winfo_rootx() + 10)
+        y = int(self.parent.winfo_pointery() - self.parent.winfo_rooty() - 10)
+        self.tooltip.place(x=x, y=y)
+
+    def animate_color(self, index, target_color, step=0):
+        """Fades bar `index` toward `target_color` over FADE_STEPS frames; a newer fade replaces it."""
+        if step == 0:
+            self.fade_targets[index] = target_color
+        elif self.fade_targets.get(index) != target_color:
+            return
+        if self.animating:
+            return
+        bar = self.bars[index]
+        start_color = mcolors.to_rgb(bar.get_facecolor())
+        end_color = mcolors.to_rgb(target_color)
+        factor = 1 / (FADE_STEPS - step)
+        new_color = tuple(start_color[i] + (end_color[i] - start_color[i]) * factor for i in range(3))
+        bar.set_facecolor(new_color)
+        self.canvas.draw_idle()
+        if step + 1 < FADE_STEPS:
+            self.parent.after(FADE_DELAY, lambda: self.animate_color(index, target_color, step + 1))
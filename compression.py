@@ -0,0 +1,480 @@
+import heapq, math, struct
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import accumulate
+from frequency import ALPHABET, letter_indices
+from instrument import STATS
+from rans import RansCoder
+
+HEADER = struct.Struct(">Q")        ## numărul de litere din flux
+BLOCK = 1 << 20                     ## litere (sau octeți la decodare) procesate odată; număr par
+
+NO_NODE = -1
+
+class CodeTree:
+    """A binary code tree as parallel arrays indexed by integer node id.
+
+    freq/left/right are `array`s, so a node costs a few machine words instead of a
+    Python object; symbols[id] is the letter of a leaf and None for internal nodes.
+    Leaves have left == right == NO_NODE.
+    """
+    def __init__(self, typecode="q"):
+        self.freq = array(typecode)     ## "q" pentru numărători, "d" pentru probabilități
+        self.left = array("q")
+        self.right = array("q")
+        self.symbols = []
+        self.root = NO_NODE
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def add(self, symbol, freq, left=NO_NODE, right=NO_NODE) -> int:
+        self.freq.append(freq)
+        self.left.append(left)
+        self.right.append(right)
+        self.symbols.append(symbol)
+        return len(self.symbols) - 1
+
+    def to_dict(self) -> dict:
+        return {"typecode": self.freq.typecode, "freq": self.freq.tolist(), "left": self.left.tolist(),
+                "right": self.right.tolist(), "symbols": self.symbols, "root": self.root}
+
+    @classmethod
+    def from_dict(cls, data) -> "CodeTree":
+        tree = cls(data["typecode"])
+        tree.freq.extend(data["freq"])
+        tree.left.extend(data["left"])
+        tree.right.extend(data["right"])
+        tree.symbols = list(data["symbols"])
+        tree.root = data["root"]
+        return tree
+
+    def is_leaf(self, node) -> bool:
+        return self.left[node] == NO_NODE
+
+    def codes(self) -> dict[str, str]:
+        """Code of every leaf, in pre-order (left before right) with an explicit stack."""
+        codes, left, right, symbols = {}, self.left, self.right, self.symbols
+        stack = [(self.root, "")] if self.root != NO_NODE else []
+        while stack:
+            node, prefix = stack.pop()
+            if symbols[node] is not None:
+                codes[symbols[node]] = prefix or "0"        ## str, ca "001" să nu devină 1
+                continue
+            stack.append((right[node], prefix + "1"))
+            stack.append((left[node], prefix + "0"))
+        return codes
+
+    def code_lengths(self) -> dict[str, int]:
+        """Depth of every leaf; a lone leaf still needs one bit."""
+        lengths, left, right, symbols = {}, self.left, self.right, self.symbols
+        stack = [(self.root, 0)] if self.root != NO_NODE else []
+        while stack:
+            node, depth = stack.pop()
+            if symbols[node] is not None:
+                lengths[symbols[node]] = max(depth, 1)
+            else:
+                stack.append((left[node], depth + 1))
+                stack.append((right[node], depth + 1))
+        return lengths
+
+
+class BuildCompression:
+    def __init__(self, letters: dict, symbols, max_code_length=None):
+        self.symbols = symbols
+        self.max_code_length = max_code_length      ## None = Huffman fără limită
+        self.results_huffman, self.huffman_tree = self.build_huffman()
+        self.results_shannon, self.shannon_tree = self.build_shannon_fano()
+        self.huffman_coder = HuffmanCoder(self.results_huffman, self.huffman_tree)
+        if max_code_length is None:
+            lengths = self.huffman_tree.code_lengths()
+        else:
+            lengths = package_merge(dict(self.symbols), max_code_length)
+        self.canonical_coder = CanonicalHuffmanCoder(lengths)
+        self.results_canonical = self.canonical_coder.codes
+        self.rans_coder = self.build_rans()
+
+    def length_limit_cost(self) -> dict:
+        """Average bits/letter of the (possibly length-limited) canonical code vs. plain Huffman."""
+        huffman = average_code_length(self.huffman_tree.code_lengths(), self.symbols)
+        limited = average_code_length(self.canonical_coder.lengths, self.symbols)
+        return {
+            "max_code_length": self.max_code_length,
+            "longest_code": self.canonical_coder.max_length,
+            "huffman_bits_per_letter": huffman,
+            "limited_bits_per_letter": limited,
+            "cost": limited / huffman - 1 if huffman else 0.0,       ## 0.01 = fișier cu 1% mai mare
+        }
+
+    def to_dict(self) -> dict:
+        """JSON-ready state; from_dict restores it without rebuilding any tree or code."""
+        return {
+            "symbols": self.symbols,
+            "max_code_length": self.max_code_length,
+            "huffman": self.results_huffman,
+            "shannon_fano": self.results_shannon,
+            "huffman_tree": self.huffman_tree.to_dict(),
+            "shannon_tree": self.shannon_tree.to_dict(),
+            "canonical_lengths": self.canonical_coder.lengths,
+        }
+
+    @classmethod
+    def from_dict(cls, data) -> "BuildCompression":
+        self = cls.__new__(cls)
+        self.symbols = [tuple(item) for item in data["symbols"]]
+        self.max_code_length = data["max_code_length"]
+        self.results_huffman, self.results_shannon = data["huffman"], data["shannon_fano"]
+        self.huffman_tree = CodeTree.from_dict(data["huffman_tree"])
+        self.shannon_tree = CodeTree.from_dict(data["shannon_tree"])
+        self.huffman_coder = HuffmanCoder(self.results_huffman, self.huffman_tree)
+        self.canonical_coder = CanonicalHuffmanCoder(data["canonical_lengths"])
+        self.results_canonical = self.canonical_coder.codes
+        self.rans_coder = self.build_rans()         ## derivat din symbols, deci nu e salvat
+        return self
+
+    def encode(self, text) -> bytes:
+        """Canonical-Huffman-codes the letters of `text`; the stream carries only the code lengths."""
+        return self.canonical_coder.encode(text)
+
+    def decode(self, data) -> str:
+        return CanonicalHuffmanCoder.from_stream(data).decode(data)
+
+    def build_huffman(self):
+        with STATS.timer("huffman"):
+            tree = huffman_tree(self.symbols)
+            return tree.codes(), tree
+
+    def build_shannon_fano(self):
+        with STATS.timer("shannon"):
+            return shannon_fano(self.symbols)
+
+    def build_rans(self):
+        """The rANS backend, or None when the symbols are not single letters (e.g. n-grams)."""
+        if not set(ALPHABET).issuperset(symbol for symbol, _ in self.symbols):
+            return None
+        with STATS.timer("rans"):
+            return RansCoder.from_counts(dict(self.symbols))
+
+    def coder_comparison(self) -> dict:
+        """Cost of every backend on the analysed counts, next to the Shannon entropy, from the counts alone.
+
+        `payload_bits_per_letter` is the model cost: exact for the prefix codes, and under the
+        quantized table for rANS. `header_bytes` is the fixed part of a stream (code table,
+        letter count, rANS final states), and `stream_bits_per_letter` both together: exact
+        for canonical Huffman, within a byte or two of RansCoder.encode for rANS. Shannon–Fano
+        has no stream format, so it has no header.
+        """
+        letters = sum(f for _, f in self.symbols)
+
+        def cost(payload_bits, header_bytes=None) -> dict:
+            stream = None
+            if header_bytes is not None and letters:
+                stream = (header_bytes * 8 + math.ceil(payload_bits / 8) * 8) / letters
+            return {"payload_bits_per_letter": payload_bits / letters if letters else 0.0,
+                    "header_bytes": header_bytes, "stream_bits_per_letter": stream}
+
+        canonical = self.canonical_coder.lengths
+        shannon_lengths = {symbol: len(code) for symbol, code in self.results_shannon.items()}
+        rans = None
+        if self.rans_coder:
+            rans = cost(self.rans_coder.expected_bits_per_letter(dict(self.symbols)) * letters,
+                        self.rans_coder.header_bytes())
+        return {
+            "letters": letters,
+            "entropy_bits_per_letter": entropy(dict(self.symbols)),
+            "rans": rans,
+            "huffman": cost(sum(f * canonical[s] for s, f in self.symbols), self.canonical_coder.header_bytes()),
+            "shannon_fano": cost(sum(f * shannon_lengths[s] for s, f in self.symbols)),
+        }
+
+
+def huffman_tree(symbols) -> CodeTree:
+    """Huffman tree for (symbol, count) pairs, linear after sorting (two-queue method).
+
+    Leaves are added sorted by count (ties by symbol), so they form the first queue;
+    merged nodes are appended after them in non-decreasing order and form the second.
+    The two cheapest nodes are always at the queue fronts; on a tie the leaf goes first.
+    """
+    tree = CodeTree()
+    for symbol, count in sorted(symbols, key=lambda x: (x[1], x[0])):
+        tree.add(symbol, count)
+    n = len(tree)
+    if n <= 1:
+        tree.root = n - 1           ## NO_NODE pentru alfabet gol
+        return tree
+
+    freq = tree.freq
+    leaf, merged = 0, n             ## capetele celor două cozi
+    for _ in range(n - 1):
+        pair = []
+        for _ in range(2):
+            if merged == len(freq) or (leaf < n and freq[leaf] <= freq[merged]):
+                pair.append(leaf)
+                leaf += 1
+            else:
+                pair.append(merged)
+                merged += 1
+        tree.add(None, freq[pair[0]] + freq[pair[1]], pair[0], pair[1])
+    tree.root = len(tree) - 1
+    return tree
+
+
+def shannon_fano(symbols) -> tuple[dict[str, str], CodeTree]:
+    """Shannon–Fano codes and tree for (symbol, count) pairs, in O(n log n).
+
+    The symbols are sorted by descending count (ties by symbol) here, so the codes do not
+    depend on the order the caller keeps them in. Every split is found by binary search
+    in the prefix sums: the left half is the shortest run holding at least half the weight.
+    Ranges are split from an explicit stack, so skewed inputs of any depth are fine.
+    Node weights in the tree are probabilities rounded to two decimals.
+    """
+    ordered = sorted(symbols, key=lambda x: (-x[1], x[0]))
+    prefix = list(accumulate((f for _, f in ordered), initial=0))
+    total = prefix[-1]
+    codes, tree = {}, CodeTree("d")
+    if not ordered:
+        return codes, tree
+
+    # (lo, hi, cod, părinte, e copil drept); ponderea unui nod se știe din sumele prefix,
+    # deci nodul se creează la intrare și se leagă imediat de părinte
+    stack = [(0, len(ordered), "", NO_NODE, False)]
+    while stack:
+        lo, hi, code, parent, is_right = stack.pop()
+        if hi - lo == 1:
+            codes[ordered[lo][0]] = code or "0"
+            node = tree.add(ordered[lo][0], round(ordered[lo][1] / total, 2))
+        else:
+            node = tree.add(None, round((prefix[hi] - prefix[lo]) / total, 2))
+            half = prefix[lo] + (prefix[hi] - prefix[lo] + 1) // 2        ## ceil, ca să rămână întregi
+            mid = min(max(bisect_left(prefix, half, lo + 1, hi), lo + 1), hi - 1)
+            stack.append((mid, hi, code + "1", node, True))
+            stack.append((lo, mid, code + "0", node, False))
+        if parent == NO_NODE:
+            tree.root = node
+        elif is_right:
+            tree.right[parent] = node
+        else:
+            tree.left[parent] = node
+    return codes, tree
+
+
+def package_merge(freqs: dict[str, int], max_length) -> dict[str, int]:
+    """Optimal prefix code lengths with no code longer than `max_length` (package-merge).
+
+    Every level pairs the cheapest items into packages and merges them back with the
+    leaves; the 2n - 2 cheapest items of the last level give how often each symbol
+    is chosen, which is its code length.
+    """
+    if len(freqs) <= 1:
+        return {symbol: 1 for symbol in freqs}
+    if 1 << max_length < len(freqs):
+        raise ValueError(f"{len(freqs)} simboluri nu încap în coduri de cel mult {max_length} biți")
+
+    # element = (greutate, simbol) pentru frunze sau (greutate, (element, element)) pentru pachete
+    leaves = sorted(((f, symbol) for symbol, f in freqs.items()), key=lambda x: (x[0], x[1]))
+    items = leaves
+    for _ in range(max_length - 1):
+        packages = [(a[0] + b[0], (a, b)) for a, b in zip(items[0::2], items[1::2])]
+        items = list(heapq.merge(leaves, packages, key=lambda x: x[0]))
+
+    lengths = dict.fromkeys(freqs, 0)
+    stack = items[:2 * len(freqs) - 2]
+    while stack:
+        _, payload = stack.pop()
+        if isinstance(payload, tuple):
+            stack.extend(payload)
+        else:
+            lengths[payload] += 1
+    return lengths
+
+
+def average_code_length(lengths: dict[str, int], symbols) -> float:
+    total = sum(f for _, f in symbols)
+    return sum(f * lengths[s] for s, f in symbols) / total if total else 0.0
+
+
+def entropy(counts) -> float:
+    """Shannon entropy in bits per symbol, the bound every code here is measured against."""
+    total = sum(counts.values())
+    return -sum(c / total * math.log2(c / total) for c in counts.values() if c) if total else 0.0
+
+
+def canonical_codes(lengths: dict[str, int]) -> dict[str, str]:
+    """Canonical prefix codes: shorter codes first, ties broken by symbol, consecutive values."""
+    codes, code, previous = {}, 0, 0
+    for symbol, length in sorted(lengths.items(), key=lambda x: (x[1], x[0])):
+        code <<= length - previous
+        codes[symbol] = format(code, f"0{length}b")
+        code, previous = code + 1, length
+    return codes
+
+
+class HuffmanCoder:
+    """Packs letters into bytes with a prefix code table, and unpacks them by walking the tree.
+
+    Stream layout: HEADER (letter count) followed by the codes, MSB first, zero-padded
+    to a whole byte.
+    """
+    def __init__(self, codes: dict[str, str], tree: CodeTree):
+        self.codes = codes
+        self.tree = tree
+        # codurile a două litere alăturate, indexate ca uint16 (index1 | index2 << 8)
+        by_index = [codes.get(letter) for letter in ALPHABET]
+        self._single = by_index + [None] * (256 - len(by_index))
+        self._pairs = [None] * (1 << 16)
+        for a, code_a in enumerate(by_index):
+            for b, code_b in enumerate(by_index):
+                if code_a is not None and code_b is not None:
+                    self._pairs[a | b << 8] = code_a + code_b
+
+    def _bits(self, indices) -> str:
+        # join + int(bits, 2) rulează în C: ~11 MB/s, față de ~6 MB/s cu un acumulator întreg per literă
+        tail = ""
+        if len(indices) % 2:
+            tail, indices = self._single[indices[-1]], indices[:-1]
+        return "".join(map(self._pairs.__getitem__, memoryview(indices).cast("H"))) + tail
+
+    def encode(self, text) -> bytes:
+        """Encodes the letters of `text` (str, or UTF-8 bytes/bytearray)."""
+        indices = letter_indices(text.encode() if isinstance(text, str) else text)
+        out = bytearray(HEADER.pack(len(indices)))
+        carry = ""
+        for i in range(0, len(indices), BLOCK):
+            try:
+                bits = carry + self._bits(indices[i:i + BLOCK])
+            except TypeError:
+                missing = sorted({ALPHABET[j] for j in indices[i:i + BLOCK]} - self.codes.keys())
+                raise ValueError(f"Litere fără cod Huffman: {', '.join(missing)}") from None
+            whole = len(bits) - len(bits) % 8
+            if whole:
+                out += int(bits[:whole], 2).to_bytes(whole // 8, "big")
+            carry = bits[whole:]
+        if carry:
+            out += int(carry.ljust(8, "0"), 2).to_bytes(1, "big")
+        return bytes(out)
+
+    def decode(self, data) -> str:
+        (count,) = HEADER.unpack_from(data)
+        tree = self.tree
+        if tree is None or tree.root == NO_NODE or count == 0:
+            return ""
+        left, right, symbols, root = tree.left, tree.right, tree.symbols, tree.root
+        if symbols[root] is not None:       ## o singură literă: fiecare bit "0" e o literă
+            return symbols[root] * count
+
+        out, node = [], root
+        for i in range(HEADER.size, len(data), BLOCK):
+            block = data[i:i + BLOCK]
+            for bit in bin(int.from_bytes(block, "big"))[2:].zfill(len(block) * 8):
+                node = right[node] if bit == "1" else left[node]
+                symbol = symbols[node]
+                if symbol is not None:
+                    out.append(symbol)
+                    if len(out) == count:
+                        return "".join(out)
+                    node = root
+        raise ValueError("Flux Huffman trunchiat")
+
+    def bits_per_letter(self, data) -> float:
+        (count,) = HEADER.unpack_from(data)
+        return (len(data) - HEADER.size) * 8 / count if count else 0.0
+
+
+@lru_cache(maxsize=64)
+def decode_table(lengths: tuple[tuple[str, int], ...], width: int) -> dict[str, tuple[str, int]]:
+    """CanonicalHuffmanCoder._build_table for sorted (symbol, length) pairs; do not mutate the result.
+
+    Blocks of one file usually share their lengths, so a container decodes
+    them all with one table per process instead of one per block.
+    """
+    by_code = {code: symbol for symbol, code in canonical_codes(dict(lengths)).items()}
+    table = {}
+    for value in range(1 << width):
+        window = format(value, f"0{width}b")
+        symbols, start = [], 0
+        for end in range(1, width + 1):
+            symbol = by_code.get(window[start:end])
+            if symbol is not None:
+                symbols.append(symbol)
+                start = end
+        if start:
+            table[window] = ("".join(symbols), start)
+    return table
+
+
+class CanonicalHuffmanCoder(HuffmanCoder):
+    """Canonical Huffman codes rebuilt from their lengths, decoded through a lookup table.
+
+    Stream layout: one length byte per ALPHABET letter (0 = no code), then the
+    HuffmanCoder stream. Every table probe reads TABLE_BITS bits and yields all
+    the letters whose codes fit entirely inside them.
+    """
+    TABLE_BITS = 12         ## 4096 intrări, încape în cache-ul L1/L2
+
+    def __init__(self, lengths: dict[str, int]):
+        super().__init__(canonical_codes(lengths), None)
+        self.lengths = lengths
+        self.max_length = max(lengths.values(), default=0)
+        self._by_code = {code: symbol for symbol, code in self.codes.items()}
+        self._table = None          ## construit la prima decodare
+
+    @classmethod
+    def from_stream(cls, data) -> "CanonicalHuffmanCoder":
+        return cls({letter: length for letter, length in zip(ALPHABET, data[:len(ALPHABET)]) if length})
+
+    def _build_table(self) -> dict[str, tuple[str, int]]:
+        """window of TABLE_BITS bits -> (letters decoded from it, bits consumed).
+
+        Windows whose first code is longer than TABLE_BITS are left out. The table
+        depends only on the lengths, so coders with the same lengths share it.
+        """
+        return decode_table(tuple(sorted(self.lengths.items())), self.TABLE_BITS)
+
+    def _decode_long(self, bits, pos) -> tuple[str, int]:
+        """Slow path for a code longer than TABLE_BITS."""
+        for length in range(self.TABLE_BITS + 1, self.max_length + 1):
+            symbol = self._by_code.get(bits[pos:pos + length])
+            if symbol is not None:
+                return symbol, length
+        raise ValueError("Flux Huffman invalid")
+
+    def header_bytes(self) -> int:
+        return len(ALPHABET) + HEADER.size
+
+    def encode(self, text) -> bytes:
+        return bytes(self.lengths.get(letter, 0) for letter in ALPHABET) + super().encode(text)
+
+    def decode(self, data) -> str:
+        (count,) = HEADER.unpack_from(data, len(ALPHABET))
+        payload = data[len(ALPHABET) + HEADER.size:]
+        if count == 0:
+            return ""
+        if self._table is None:
+            self._table = self._build_table()
+
+        table, width = self._table, self.TABLE_BITS
+        lookahead = max(width, self.max_length)
+        out, bits, pos = [], "", 0
+        append = out.append
+        for i in range(0, len(payload), BLOCK):
+            block = payload[i:i + BLOCK]
+            bits = bits[pos:] + bin(int.from_bytes(block, "big"))[2:].zfill(len(block) * 8)
+            if i + BLOCK >= len(payload):
+                bits += "0" * lookahead         ## zerourile decodează mereu (primul cod canonic)
+            pos, stop = 0, len(bits) - lookahead
+            while pos <= stop:
+                try:
+                    symbols, used = table[bits[pos:pos + width]]
+                except KeyError:
+                    symbols, used = self._decode_long(bits, pos)
+                append(symbols)
+                pos += used
+
+        letters = "".join(out)
+        if len(letters) < count:
+            raise ValueError("Flux Huffman trunchiat")
+        return letters[:count]
+
+    def bits_per_letter(self, data) -> float:
+        return super().bits_per_letter(data[len(ALPHABET):])
@@ -0,0 +1,204 @@
+"""Block-indexed container: independently coded blocks, encoded and decoded across a process pool.
+
+    python -m container encode text.txt text.lfc [--workers 4] [--block-size 1]
+    python -m container decode text.lfc letters.txt
+    python -m container extract text.lfc 1000 2000
+    python -m container info text.lfc
+
+File layout: MAGIC, then the blocks, then one INDEX_ENTRY per block (its offset and
+the position of its first letter), then FOOTER. Every block is a CanonicalHuffmanCoder
+stream with code lengths built from that block's own counts. Any block can therefore
+be decoded alone, and a letter range only needs the blocks that cover it. As with the
+other coders, only the alphabet letters are stored.
+"""
+import argparse, json, os, struct, sys
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from compression import HEADER, CanonicalHuffmanCoder, huffman_tree
+from frequency import ALPHABET, count_bytes, shard_ranges
+
+MAGIC = b"LFC1"
+INDEX_ENTRY = struct.Struct(">QQ")      ## offsetul blocului, poziția primei lui litere
+FOOTER = struct.Struct(">QQQ4s")        ## offsetul indexului, blocuri, litere, MAGIC
+BLOCK_BYTES = 1 << 20                   ## octeți de text per bloc; aliniați la caractere UTF-8
+IN_FLIGHT_PER_WORKER = 4                ## blocuri trimise în avans fiecărui proces
+
+
+def encode_block(file_path, start, end) -> bytes:
+    """Bytes [start, end) of a UTF-8 file as one self-contained block; runs inside the workers."""
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        data = file.read(end - start)
+    counts = count_bytes(data)
+    lengths = huffman_tree(sorted(counts.items(), key=lambda x: x[1], reverse=True)).code_lengths() if counts else {}
+    return CanonicalHuffmanCoder(lengths).encode(data)
+
+
+def decode_block(file_path, offset, size) -> str:
+    with open(file_path, "rb") as file:
+        file.seek(offset)
+        block = file.read(size)
+    return CanonicalHuffmanCoder.from_stream(block).decode(block)
+
+
+def block_letters(block) -> int:
+    return HEADER.unpack_from(block, len(ALPHABET))[0]
+
+
+def ordered_results(function, tasks, workers):
+    """function(*task) for every task, in task order, run on `workers` processes.
+
+    At most IN_FLIGHT_PER_WORKER tasks per worker are queued, so finished blocks that
+    wait for a slower one before them never pile up beyond that.
+    """
+    if workers <= 1:
+        yield from (function(*task) for task in tasks)
+        return
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            for task in tasks:
+                pending.append(pool.submit(function, *task))
+                if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)      ## ex. anulare cerută din progress
+            raise
+
+
+def encode_file(source, target, workers=None, block_size=BLOCK_BYTES, progress=None) -> "BlockContainer":
+    """Writes the container for UTF-8 file `source` to `target`.
+
+    `progress(done, total)` is called after every block written.
+    """
+    size = os.path.getsize(source)
+    ranges = shard_ranges(source, max(1, -(-size // block_size)))
+    workers = max(1, min(workers or os.cpu_count() or 1, len(ranges)))
+    index, letters = [], 0
+    temp = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(temp, "wb") as out:
+            out.write(MAGIC)
+            for block in ordered_results(encode_block, ((source, start, end) for start, end in ranges), workers):
+                index.append(INDEX_ENTRY.pack(out.tell(), letters))
+                out.write(block)
+                letters += block_letters(block)
+                if progress:
+                    progress(len(index), len(ranges))
+            index_offset = out.tell()
+            out.write(b"".join(index))
+            out.write(FOOTER.pack(index_offset, len(index), letters, MAGIC))
+        os.replace(temp, target)        ## un container incomplet nu ajunge niciodată la `target`
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+    return BlockContainer(target)
+
+
+class BlockContainer:
+    """Read side of a container: the index is loaded once, blocks are read on demand."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        with open(file_path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < len(MAGIC) + FOOTER.size or file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{file_path} nu este un container de litere")
+            file.seek(size - FOOTER.size)
+            index_offset, blocks, self.letters, magic = FOOTER.unpack(file.read(FOOTER.size))
+            if magic != MAGIC or index_offset + blocks * INDEX_ENTRY.size != size - FOOTER.size:
+                raise ValueError(f"{file_path}: index deteriorat")
+            file.seek(index_offset)
+            entries = list(INDEX_ENTRY.iter_unpack(file.read(blocks * INDEX_ENTRY.size)))
+        self.offsets = [offset for offset, _ in entries] + [index_offset]   ## blocul i: offsets[i]..offsets[i + 1]
+        self.starts = [start for _, start in entries] + [self.letters]
+        self.compressed_bytes = size
+
+    def __len__(self):
+        return self.letters
+
+    @property
+    def blocks(self) -> int:
+        return len(self.offsets) - 1
+
+    def decode_block(self, i) -> str:
+        return decode_block(self.file_path, self.offsets[i], self.offsets[i + 1] - self.offsets[i])
+
+    def extract(self, start, stop) -> str:
+        """Letters [start, stop) of the original text, decoding only the blocks that cover them.
+
+        Like a slice, negative indices count from the end and out-of-range ones are clamped.
+        """
+        start, stop, _ = slice(start, stop).indices(self.letters)
+        if start >= stop:
+            return ""
+        first = bisect_right(self.starts, start) - 1
+        parts, i = [], first
+        while i < self.blocks and self.starts[i] < stop:
+            parts.append(self.decode_block(i))
+            i += 1
+        return "".join(parts)[start - self.starts[first]:stop - self.starts[first]]
+
+    def decode(self, workers=None):
+        """Yields the letters of every block, in order, decoded across a process pool."""
+        workers = max(1, min(workers or os.cpu_count() or 1, self.blocks))
+        tasks = ((self.file_path, self.offsets[i], self.offsets[i + 1] - self.offsets[i]) for i in range(self.blocks))
+        yield from ordered_results(decode_block, tasks, workers)
+
+    def info(self) -> dict:
+        return {
+            "blocks": self.blocks,
+            "letters": self.letters,
+            "bytes": self.compressed_bytes,
+            "bits_per_letter": self.compressed_bytes * 8 / self.letters if self.letters else 0.0,
+        }
+
+
+def decode_file(source, target, workers=None, progress=None) -> int:
+    """Writes all letters of container `source` to `target` as UTF-8; returns the letter count."""
+    container = BlockContainer(source)
+    with open(target, "w", encoding="utf-8") as out:
+        for done, letters in enumerate(container.decode(workers), 1):
+            out.write(letters)
+            if progress:
+                progress(done, container.blocks)
+    return len(container)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m container", description="Container cu blocuri Huffman canonice.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    encode = commands.add_parser("encode", help="codează un fișier UTF-8")
+    encode.add_argument("source")
+    encode.add_argument("target")
+    encode.add_argument("--block-size", type=float, default=BLOCK_BYTES / 2**20, help="MB de text per bloc")
+    decode = commands.add_parser("decode", help="scrie toate literele")
+    decode.add_argument("source")
+    decode.add_argument("target")
+    extract = commands.add_parser("extract", help="literele [start, stop), decodând doar blocurile necesare")
+    extract.add_argument("source")
+    extract.add_argument("start", type=int)
+    extract.add_argument("stop", type=int)
+    info = commands.add_parser("info", help="blocuri, litere și biți/literă, ca JSON")
+    info.add_argument("source")
+    for command in (encode, decode):
+        command.add_argument("--workers", type=int, default=None, help="procese (implicit toate nucleele)")
+    args = parser.parse_args(argv)
+
+    if args.command == "encode":
+        container = encode_file(args.source, args.target, args.workers, max(1, int(args.block_size * 2**20)))
+        print(json.dumps(container.info()))
+    elif args.command == "decode":
+        decode_file(args.source, args.target, args.workers)
+    elif args.command == "extract":
+        sys.stdout.write(BlockContainer(args.source).extract(args.start, args.stop) + "\n")
+    else:
+        print(json.dumps(BlockContainer(args.source).info()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import glob, hashlib, json, os
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from cache import CACHE_DIR, _write_json
+from frequency import count_letters, count_mapped, is_utf8
+
+TEXT_SUFFIX = ".txt"
+CORPORA = "corpora"             ## subdirector al cache-ului: în afara bugetului și a evacuării LRU
+IN_FLIGHT_PER_WORKER = 4        ## fișiere trimise în avans fiecărui proces
+
+
+def corpus_files(source) -> list[str]:
+    """The .txt files under a directory (recursively), or the files matching a glob."""
+    if os.path.isdir(source):
+        return sorted(os.path.join(root, name) for root, _, names in os.walk(source)
+                      for name in names if name.lower().endswith(TEXT_SUFFIX))
+    return sorted(path for path in glob.glob(source, recursive=True) if os.path.isfile(path))
+
+
+def index_path(sources, directory=CACHE_DIR) -> str:
+    """Where the breakdown of a corpus given by `sources` (directories or globs) is kept.
+
+    It lives in the CORPORA subdirectory of the cache `directory`, so ResultCache
+    never counts it against its size budget nor evicts it.
+    """
+    key = "\0".join(sorted(os.path.abspath(source) for source in sources))
+    return os.path.join(directory, CORPORA, f"{hashlib.blake2b(key.encode(), digest_size=20).hexdigest()}.json")
+
+
+def count_file(file_path, encoding="utf-8") -> tuple[str, int, int, Counter]:
+    """(path, size, mtime_ns, counts); runs inside the worker processes."""
+    stat = os.stat(file_path)
+    counts = count_mapped(file_path) if is_utf8(encoding) else count_letters(file_path, encoding=encoding)
+    return file_path, stat.st_size, stat.st_mtime_ns, counts
+
+
+class Corpus:
+    """Letter counts of many files: one merged Counter plus a per-file breakdown.
+
+    The breakdown remembers size and mtime of every file, so update() recounts only
+    new or changed files, and save()/load() keep it for later queries.
+    """
+
+    def __init__(self, encoding="utf-8"):
+        self.encoding = encoding
+        self.files = {}         ## cale -> (mărime, mtime_ns, Counter)
+
+    @property
+    def counts(self) -> Counter:
+        total = Counter()
+        for _, _, counts in self.files.values():
+            total.update(counts)
+        return total
+
+    def update(self, paths, workers=None, progress=None) -> int:
+        """Brings the breakdown in line with `paths`; returns how many files were counted.
+
+        At most IN_FLIGHT_PER_WORKER files per worker are queued at once, so thousands
+        of documents do not pile up as pending futures. `progress(done, total)` is called
+        after every file; an exception raised from it cancels the rest.
+        """
+        paths = list(dict.fromkeys(paths))
+        for path in self.files.keys() - set(paths):
+            del self.files[path]
+        stale = []
+        for path in paths:
+            stat = os.stat(path)
+            known = self.files.get(path)
+            if not known or known[:2] != (stat.st_size, stat.st_mtime_ns):
+                stale.append(path)
+
+        done = len(paths) - len(stale)
+        if progress:
+            progress(done, len(paths))
+        if not stale:
+            return 0
+
+        workers = max(1, min(workers or os.cpu_count() or 1, len(stale)))
+        pending, queued = set(), iter(stale)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            try:
+                while True:
+                    for path in queued:
+                        pending.add(pool.submit(count_file, path, self.encoding))
+                        if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                            break
+                    if not pending:
+                        break
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        path, size, mtime_ns, counts = future.result()
+                        self.files[path] = (size, mtime_ns, counts)
+                        done += 1
+                        if progress:
+                            progress(done, len(paths))
+            except BaseException:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+        return len(stale)
+
+    def breakdown(self, file_path) -> Counter:
+        return self.files[file_path][2]
+
+    def top_files(self, letter, n=10) -> list[tuple[str, float]]:
+        """The n files where `letter` is most frequent, with its share of their letters."""
+        shares = [(path, counts[letter] / counts.total()) for path, (_, _, counts) in self.files.items()
+                  if counts.total()]
+        return sorted(shares, key=lambda x: x[1], reverse=True)[:n]
+
+    def save(self, file_path):
+        data = {"encoding": self.encoding,
+                "files": {path: [size, mtime_ns, dict(counts)] for path, (size, mtime_ns, counts) in self.files.items()}}
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        _write_json(file_path, data)
+
+    @classmethod
+    def load(cls, file_path, encoding="utf-8") -> "Corpus":
+        """A saved breakdown, or an empty corpus if there is none (or it was made with another encoding)."""
+        corpus = cls(encoding)
+        try:
+            with open(file_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return corpus
+        if data.get("encoding") == encoding:
+            corpus.files = {path: (size, mtime_ns, Counter(counts)) for path, (size, mtime_ns, counts) in data["files"].items()}
+        return corpus
@@ -0,0 +1,308 @@
+import codecs, mmap, os
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from instrument import STATS
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyzăâîșț"
+ROMANIAN_ALPHABET = "aăâbcdefghiîjklmnopqrsștțuvwxyz"     ## ordinea din alfabetul român
+
+# formele (deja lower) numărate ca fiecare literă; ş/ţ cu sedilă sunt pliate în ș/ț
+LETTER_FORMS = {letter: letter for letter in ALPHABET} | {"ș": "șş", "ț": "țţ"}
+
+# aceleași forme ca octeți UTF-8, după LOWER_ASCII; literele non-ASCII apar și cu majusculă, iar k și ca K (Kelvin)
+BYTE_FORMS = {letter: tuple(f.encode() for f in forms) + tuple(f.upper().encode() for f in forms if not f.isascii())
+              for letter, forms in LETTER_FORMS.items()}
+BYTE_FORMS["k"] += ("\u212a".encode(),)
+LEAD_BYTES = {form[:1] for forms in BYTE_FORMS.values() for form in forms if len(form) > 1}
+LOWER_ASCII = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"abcdefghijklmnopqrstuvwxyz")
+
+# octeți care nu apar niciodată în UTF-8 valid, folosiți temporar în locul lui ă/â/î/ș/ț
+PLACEHOLDERS = {letter: bytes([0xF8 + i]) for i, letter in enumerate(ALPHABET[26:])}
+MULTIBYTE_PLACEHOLDERS = {lead: [(form, PLACEHOLDERS.get(letter, letter.encode()))
+                                 for letter, forms in BYTE_FORMS.items() for form in forms if form[:1] == lead]
+                          for lead in LEAD_BYTES}
+_INDEXED = ALPHABET[:26].encode() + ALPHABET[:26].upper().encode() + b"".join(PLACEHOLDERS.values())
+LETTER_INDEX = bytes.maketrans(_INDEXED, bytes(range(26)) * 2 + bytes(range(26, 31)))
+NOT_LETTERS = bytes(sorted(set(range(256)) - set(_INDEXED)))
+INDEX_TO_LATIN1 = bytes.maketrans(bytes(range(31)), ALPHABET[:26].encode() + b"".join(PLACEHOLDERS.values()))
+
+CHUNK_SIZE = 1 << 20        ## octeți (caractere pentru fluxurile text, ex. stdin) citiți per bucată
+MIN_SHARD_SIZE = 8 << 20    ## sub această mărime un proces în plus nu se mai amortizează; și mărimea unei sarcini
+IN_FLIGHT_PER_WORKER = 4    ## sarcini trimise în avans fiecărui proces
+
+
+def count_text(text, counts=None) -> Counter:
+    """Adds the alphabet letters of `text` to `counts`, one C-level pass per letter form."""
+    counts = Counter() if counts is None else counts
+    lowered = text.lower()
+    for letter, forms in LETTER_FORMS.items():
+        n = sum(map(lowered.count, forms))
+        if letter == "i":
+            n -= text.count("İ")        ## 'İ'.lower() este 'i' + punct combinat, nu o literă
+        if n:
+            counts[letter] += n
+    return counts
+
+
+def count_bytes(data, counts=None) -> Counter:
+    """Adds the letters of UTF-8 encoded `data` to `counts` without decoding it."""
+    counts = Counter() if counts is None else counts
+    lowered = data.translate(LOWER_ASCII)
+    # o secvență multi-octet se numără doar dacă primul ei octet apare măcar o dată (memchr)
+    leads = set() if data.isascii() else {lead for lead in LEAD_BYTES if lead in data}
+    for letter, forms in BYTE_FORMS.items():
+        n = sum(lowered.count(form) for form in forms if len(form) == 1 or form[:1] in leads)
+        if n:
+            counts[letter] += n
+    return counts
+
+
+def is_utf8(encoding):
+    return codecs.lookup(encoding).name in ("utf-8", "utf-8-sig")
+
+
+def letter_indices(data) -> bytes:
+    """One byte per letter of UTF-8 `data` (its index in ALPHABET), everything else dropped.
+
+    Letters are recognised exactly like count_bytes does, with C-level replace/translate only.
+    """
+    data = bytes(data)
+    if not data.isascii():
+        for lead, forms in MULTIBYTE_PLACEHOLDERS.items():
+            if lead in data:
+                for form, placeholder in forms:
+                    data = data.replace(form, placeholder)
+    return data.translate(LETTER_INDEX, NOT_LETTERS)
+
+
+def index_letters(indices) -> str:
+    """The letters of a letter_indices() result, back as text."""
+    letters = bytes(indices).translate(INDEX_TO_LATIN1).decode("latin-1")
+    for letter, placeholder in PLACEHOLDERS.items():
+        letters = letters.replace(placeholder.decode("latin-1"), letter)
+    return letters
+
+
+def letters_only(text) -> str:
+    """The letters of `text` exactly as count_text sees them: lowercased, folded, nothing else."""
+    return index_letters(letter_indices(text.encode()))
+
+
+def count_letters(file_path, chunk_size=CHUNK_SIZE, encoding="utf-8", progress=None) -> Counter:
+    """Counts the alphabet letters of a file chunk by chunk, in constant memory.
+
+    `progress`, if given, is called with the number of bytes consumed after every chunk.
+    """
+    counts = Counter()
+    # decodorul incremental păstrează întregi ă/â/î/ș/ț tăiate între bucăți
+    decoder = codecs.getincrementaldecoder(encoding)()
+    with open(file_path, "rb") as file:
+        while True:
+            with STATS.timer("read"):
+                data = file.read(chunk_size)
+            with STATS.timer("decode"):
+                text = decoder.decode(data, final=not data)
+            with STATS.timer("count"):
+                count_text(text, counts)
+            if not data:
+                return counts
+            STATS.count("bytes", len(data))
+            if progress:
+                progress(file.tell())
+
+
+def _is_continuation(byte):
+    return 0x80 <= byte <= 0xBF         ## 10xxxxxx, interiorul unei secvențe UTF-8
+
+
+def complete_end(file, start, end) -> int:
+    """`end` moved back before a UTF-8 sequence that is still being written, but not before `start`."""
+    file.seek(max(start, end - 3))
+    tail = file.read(end - max(start, end - 3))
+    for i in range(len(tail) - 1, -1, -1):
+        byte = tail[i]
+        if not _is_continuation(byte):
+            needed = 1 if byte < 0xC0 else 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+            return end if len(tail) - i >= needed else end - (len(tail) - i)
+    return end
+
+
+def shard_ranges(file_path, shards) -> list[tuple[int, int]]:
+    """Splits a file into `shards` byte ranges that start on UTF-8 character boundaries."""
+    size = os.path.getsize(file_path)
+    bounds = [0]
+    with open(file_path, "rb") as file:
+        for i in range(1, shards):
+            offset = max(size * i // shards, bounds[-1])
+            file.seek(offset)
+            for byte in file.read(4):
+                if not _is_continuation(byte):
+                    break
+                offset += 1
+            bounds.append(offset)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def mapped_windows(file_path, start=0, end=None, window=CHUNK_SIZE):
+    """Yields bytes [start, end) of a UTF-8 file through mmap, about `window` bytes at a time.
+
+    A window is extended past `window` so it never ends inside a multi-byte letter;
+    only the window being yielded is copied out of the mapping.
+    """
+    with open(file_path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        end = size if end is None else min(end, size)
+        if start >= end:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            position = start
+            while position < end:
+                stop = min(position + window, end)
+                while stop < end and _is_continuation(mapped[stop]):
+                    stop += 1           ## nu tăia o literă multi-octet între ferestre
+                with STATS.timer("read"):       ## copierea ferestrei: aici apar page fault-urile
+                    data = mapped[position:stop]
+                yield data
+                position = stop
+
+
+def count_mapped(file_path, start=0, end=None, window=CHUNK_SIZE, progress=None) -> Counter:
+    """Counts the letters in bytes [start, end) of a UTF-8 file by scanning it through mmap.
+
+    Only one cache-sized window is materialised at a time and nothing is decoded;
+    malformed UTF-8 is skipped instead of raising UnicodeDecodeError. `progress`,
+    if given, is called with the number of bytes scanned after every window.
+    """
+    counts, done = Counter(), 0
+    for data in mapped_windows(file_path, start, end, window):
+        with STATS.timer("count"):
+            count_bytes(data, counts)
+        STATS.count("bytes", len(data))
+        done += len(data)
+        if progress:
+            progress(done)
+    return counts
+
+
+def _count_shard(file_path, start, end, window, instrumented):
+    """count_mapped in a pool worker, plus the worker's timers when instrumentation is on."""
+    if not instrumented:
+        return count_mapped(file_path, start, end, window), None
+    STATS.enable()
+    STATS.reset()           ## un worker poate primi mai multe fragmente
+    return count_mapped(file_path, start, end, window), STATS.snapshot()
+
+
+def count_letters_parallel(file_path, workers=None, chunk_size=CHUNK_SIZE, encoding="utf-8", progress=None) -> Counter:
+    """Counts the letters of a file across a process pool, in UTF-8 aligned tasks of about MIN_SHARD_SIZE.
+
+    Other encodings cannot be split on UTF-8 boundaries and use the streaming text path.
+    `progress` receives the bytes done so far, after every task. At most
+    IN_FLIGHT_PER_WORKER tasks per worker are queued, so an exception raised from
+    `progress` (e.g. a cancel) stops submitting and only waits for the running tasks.
+    """
+    if not is_utf8(encoding):
+        return count_letters(file_path, chunk_size, encoding, progress)
+
+    size = os.path.getsize(file_path)
+    workers = min(workers or os.cpu_count() or 1, size // MIN_SHARD_SIZE)
+    if workers <= 1:
+        return count_mapped(file_path, window=chunk_size, progress=progress)
+
+    counts, done = Counter(), 0
+    pending, queued = {}, iter(shard_ranges(file_path, -(-size // MIN_SHARD_SIZE)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            while True:
+                for start, end in queued:
+                    pending[pool.submit(_count_shard, file_path, start, end, chunk_size, STATS.enabled)] = end - start
+                    if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                        break
+                if not pending:
+                    break
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    shard_counts, stages = future.result()
+                    counts.update(shard_counts)
+                    if stages:
+                        STATS.merge(stages)
+                    done += pending.pop(future)
+                    if progress:
+                        progress(done)
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)      ## ex. anulare cerută din progress
+            raise
+    return counts
+
+
+class FileTail:
+    """Letter counts of a growing UTF-8 file, updated by reading only the bytes appended since the last poll.
+
+    The file is recounted from byte 0 only when it was truncated, replaced by another
+    file (new inode) or when the last bytes already counted no longer match.
+    """
+    CHECK_BYTES = 4096      ## ultimii octeți numărați, comparați la fiecare poll
+
+    def __init__(self, file_path, window=CHUNK_SIZE):
+        self.file_path = file_path
+        self.window = window
+        self.counts = Counter()
+        self.offset = 0             ## octeți deja numărați
+        self.identity = None        ## (st_dev, st_ino) al fișierului numărat
+        self.checkpoint = b""
+        self.rescans = 0
+
+    @staticmethod
+    def version(file_path) -> tuple[int, int, int, int]:
+        """(st_dev, st_ino, size, mtime_ns) of a file, taken before a full count for after_count()."""
+        stat = os.stat(file_path)
+        return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    @classmethod
+    def after_count(cls, file_path, counts, version, window=CHUNK_SIZE) -> "FileTail":
+        """A tail that resumes from `counts` of a full count begun when the file was at `version`.
+
+        Offset and checkpoint are taken now, so call it right after the count. If the file
+        changed meanwhile the tail starts empty and its first poll counts the file again.
+        """
+        tail = cls(file_path, window)
+        with open(file_path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            if (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns) == tuple(version):
+                tail.counts = Counter(counts)
+                tail.offset = complete_end(file, 0, stat.st_size)      ## o literă tăiată nu a fost numărată
+                tail.identity = (stat.st_dev, stat.st_ino)
+                tail.checkpoint = tail._read_checkpoint(file, tail.offset)
+        return tail
+
+    def copy(self) -> "FileTail":
+        tail = FileTail(self.file_path, self.window)
+        tail.counts = self.counts.copy()
+        tail.offset, tail.identity, tail.checkpoint, tail.rescans = self.offset, self.identity, self.checkpoint, self.rescans
+        return tail
+
+    def _read_checkpoint(self, file, end) -> bytes:
+        file.seek(max(0, end - self.CHECK_BYTES))
+        return file.read(min(end, self.CHECK_BYTES))
+
+    def poll(self) -> tuple[Counter, bool]:
+        """(letters counted by this call, whether the file was recounted from the start)."""
+        with open(self.file_path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            identity = (stat.st_dev, stat.st_ino)
+            rescan = (identity != self.identity or stat.st_size < self.offset
+                      or self._read_checkpoint(file, self.offset) != self.checkpoint)
+            if rescan:
+                if self.identity is not None:
+                    self.rescans += 1
+                self.counts, self.offset, self.identity, self.checkpoint = Counter(), 0, identity, b""
+
+            end = complete_end(file, self.offset, stat.st_size)   ## o literă scrisă pe jumătate așteaptă poll-ul următor
+            if end <= self.offset:
+                return Counter(), rescan
+            added = count_mapped(self.file_path, self.offset, end, self.window)
+            self.counts.update(added)
+            self.offset = end
+            self.checkpoint = self._read_checkpoint(file, end)
+        return added, rescan
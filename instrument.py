@@ -0,0 +1,159 @@
+"""Opt-in timers and counters around the pipeline stages, plus cProfile/tracemalloc capture.
+
+    with STATS.timer("count"):
+        count_bytes(data, counts)
+    STATS.count("bytes", len(data))
+
+While disabled (the default) a probe is one attribute check returning a shared no-op
+context manager, so the probes stay in the hot paths for good.
+"""
+import contextlib, cProfile, os, pstats, threading, time, tracemalloc
+
+STAGES = ("read", "decode", "count", "sort", "huffman", "shannon", "rans", "draw", "draw_tree")
+PROFILE_MODES = ("cprofile", "tracemalloc")
+PROFILE_TOP = 20        ## funcții / linii de alocare păstrate dintr-o captură
+NULL = contextlib.nullcontext()
+
+
+class _Timer:
+    __slots__ = ("stats", "name", "started")
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add_time(self.name, time.perf_counter() - self.started)
+
+
+class Instruments:
+    """Named timers (calls, total, max) and counters, shared by every thread of the process.
+
+    Pool workers have their own copy: they return snapshot() with their result and the
+    parent merge()s it, so worker times are summed over processes, not wall-clock.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.timers = {}        ## nume -> [apeluri, secunde în total, maxim]
+        self.counters = {}
+        self.profile = None     ## rezultatul ultimei capturi cProfile/tracemalloc
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def reset(self):
+        with self.lock:
+            self.timers, self.counters, self.profile = {}, {}, None
+
+    def timer(self, name):
+        return _Timer(self, name) if self.enabled else NULL
+
+    def add_time(self, name, seconds, calls=1):
+        with self.lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                self.timers[name] = [calls, seconds, seconds / calls]
+            else:
+                timer[0] += calls
+                timer[1] += seconds
+                timer[2] = max(timer[2], seconds / calls)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self.lock:
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, snapshot):
+        """Adds the timers and counters of another process's snapshot()."""
+        for name, timer in snapshot["timers"].items():
+            self.add_time(name, timer["total_ms"] / 1000, timer["calls"])
+            with self.lock:
+                self.timers[name][2] = max(self.timers[name][2], timer["max_ms"] / 1000)
+        for name, n in snapshot["counters"].items():
+            self.count(name, n)
+
+    def snapshot(self) -> dict:
+        """JSON-ready timers (ms), counters and the last profile capture; pipeline stages first."""
+        with self.lock:
+            order = {name: i for i, name in enumerate(STAGES)}
+            timers = {
+                name: {"calls": calls, "total_ms": total * 1000, "mean_ms": total / calls * 1000, "max_ms": peak * 1000}
+                for name, (calls, total, peak) in sorted(self.timers.items(), key=lambda x: (order.get(x[0], len(order)), x[0]))
+            }
+            snapshot = {"enabled": self.enabled, "timers": timers, "counters": dict(self.counters)}
+            if self.profile is not None:
+                snapshot["profile"] = self.profile
+            return snapshot
+
+    @contextlib.contextmanager
+    def capture(self, mode=None, top=PROFILE_TOP):
+        """Profiles the block with cProfile (calling thread only) or tracemalloc; None does nothing.
+
+        The result is kept in self.profile and shows up in snapshot().
+        """
+        if mode is None:
+            yield
+            return
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                self.profile = {"mode": mode, "functions": top_functions(profiler, top)}
+        elif mode == "tracemalloc":
+            tracing = tracemalloc.is_tracing()
+            if not tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            try:
+                yield
+            finally:
+                peak = tracemalloc.get_traced_memory()[1]
+                lines = tracemalloc.take_snapshot().statistics("lineno")[:top]
+                if not tracing:
+                    tracemalloc.stop()
+                self.profile = {
+                    "mode": mode,
+                    "peak_mb": peak / 2**20,
+                    "allocations": [{"line": f"{os.path.basename(s.traceback[0].filename)}:{s.traceback[0].lineno}",
+                                     "size_kb": s.size / 1024, "count": s.count} for s in lines],
+                }
+        else:
+            raise ValueError(f"Mod de profilare necunoscut: {mode} (alege din {', '.join(PROFILE_MODES)})")
+
+
+def top_functions(profiler, top=PROFILE_TOP) -> list[dict]:
+    """The `top` functions of a cProfile run by cumulative time."""
+    rows = sorted(pstats.Stats(profiler).stats.items(), key=lambda x: x[1][3], reverse=True)[:top]
+    return [{"function": f"{os.path.basename(file)}:{line}({name})", "calls": calls,
+             "own_ms": own * 1000, "cumulative_ms": cumulative * 1000}
+            for (file, line, name), (_, calls, own, cumulative, _) in rows]
+
+
+def format_snapshot(snapshot) -> str:
+    """Plain-text table of a snapshot(), for the debug panel."""
+    lines = [f"{'etapă':12s} {'apeluri':>8s} {'total ms':>11s} {'medie ms':>10s} {'max ms':>10s}"]
+    for name, t in snapshot["timers"].items():
+        lines.append(f"{name:12s} {t['calls']:8d} {t['total_ms']:11.2f} {t['mean_ms']:10.3f} {t['max_ms']:10.3f}")
+    if snapshot["counters"]:
+        lines.append("")
+        lines.extend(f"{name:12s} {n:>12,}" for name, n in snapshot["counters"].items())
+    profile = snapshot.get("profile")
+    if profile and profile["mode"] == "cprofile":
+        lines += ["", f"{'cumulativ ms':>12s} {'propriu ms':>11s} {'apeluri':>8s}  funcție"]
+        lines.extend(f"{f['cumulative_ms']:12.2f} {f['own_ms']:11.2f} {f['calls']:8d}  {f['function']}"
+                     for f in profile["functions"])
+    elif profile:
+        lines += ["", f"vârf tracemalloc: {profile['peak_mb']:.2f} MB"]
+        lines.extend(f"{a['size_kb']:10.1f} KB {a['count']:8d}  {a['line']}" for a in profile["allocations"])
+    return "\n".join(lines)
+
+
+STATS = Instruments()
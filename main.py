@@ -1,17 +1,9 @@
-import tkinter as tk, matplotlib.colors as mcolors, os, threading
+import tkinter as tk, os, threading, queue, time
 from tkinter import filedialog, LEFT, RIGHT
-from collections import Counter
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from frequency import count_letters_parallel, ROMANIAN_ALPHABET
+from compression import shannon_fano
 
 
-class Node:
-    def __init__(self, symbol=None, freq=0, left=None, right=None):
-        self.symbol = symbol
-        self.freq = freq
-        self.left = left
-        self.right = right
-
 class BuildCompression:
     """dict with every letter and its apparition"""
     def __init__(self, letters: dict[str, int], symbols, text_box):
@@ -23,11 +15,7 @@ class BuildCompression:
 
     def build_shannon_fano(self):
         """Creează codurile Shannon–Fano pe baza frecvenței."""
-        total = sum(c for _, c in self.symbols)              ## totalul cuvintelor
-        probs = [(l, c / total) for l, c in self.symbols]        ## (litera, numar apar caracter / total) = for l, c in lista de dict
-
-        codes = {}
-        self._recursive_build(probs, codes)
+        codes, self.node = shannon_fano(self.symbols)        ## sortează singur, deci nu depinde de modul de sortare din UI
         print("Coduri Shannon–Fano:")
         for c, code in codes.items():
             print(f"{c}: {code}")
@@ -38,142 +26,30 @@ class BuildCompression:
         self.shanon_text.delete("1.0", tk.END)
         for c, code in self.results_txt.items():
             self.shanon_text.insert(tk.END, f"{c}: {code}\n")
-    
-    def _recursive_build(self, symbols, codes, prefix="") -> Node:      ## builds the tree and codes
-        """Recursiv — împarte lista și atribuie coduri binare."""
-        if len(symbols) == 1:
-            letter = symbols[0][0]
-            codes[letter] = int(prefix or "0")          ## conv to int instead of str
-            return
-
-        total = sum(p for _, p in symbols)
-        acc, split_index = 0, 0
-        for i, (_, p) in enumerate(symbols):
-            acc += p
-            if acc >= total / 2:
-                split_index = i + 1
-                break
-
-        left = symbols[:split_index]
-        right = symbols[split_index:]
-
-        self._recursive_build(left, codes, prefix + "0")
-        self._recursive_build(right, codes, prefix + "1")
-
-        self.node = Node(None, total, left, right) 
-
-class InteractiveChart:
-    """Chart with smooth height animation and hover tooltip."""
-
-    def __init__(self, parent):
-        self.parent = parent
-        self.figure = Figure(figsize=(8, 3), dpi=100)
-        self.ax = self.figure.add_subplot(111)
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.parent)
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
-
-        self.tooltip = tk.Label(parent, bg="#333", fg="white", padx=5, pady=2, font=("Segoe UI", 10))
-        self.tooltip.place_forget()
-
-        self.bars = []
-        self.data = []
-        self.animating = False
-
-        self.canvas.mpl_connect("motion_notify_event", self.on_hover)
-
-    def draw_chart(self, sorted_counts):
-        """Initial chart draw."""
-        self.ax.clear()
-        letters = [l for l, _ in sorted_counts]
-        counts = [c for _, c in sorted_counts]
-
-        self.bars = self.ax.bar(letters, counts, color="#3a7bd5")
-        self.data = sorted_counts
-
-        self.ax.set_xlabel("Litere")
-        self.ax.set_ylabel("Total")
-        self.ax.set_title("Frecventa de aparitie")
-        self.ax.grid(True, linestyle="--", alpha=0.5)
-        self.canvas.draw()
-
-    def update_chart_smooth(self, sorted_counts, steps=10, delay=30, on_complete=None):
-        if self.animating: return 
 
-        if not self.bars or len(self.bars) != len(sorted_counts):
-            self.draw_chart(sorted_counts)
-            if on_complete:
-                on_complete()
-            return
-
-        current_heights = [bar.get_height() for bar in self.bars]
-        new_heights = [c for _, c in sorted_counts]
-        letters = [l for l, _ in sorted_counts]
-
-        self.animating = True
-
-        def step(i):
-            factor = (i + 1) / steps
-            for bar, h_old, h_new in zip(self.bars, current_heights, new_heights):
-                bar.set_height(h_old + (h_new - h_old) * factor)
-
-            self.ax.set_xticks(range(len(letters)))
-            self.ax.set_xticklabels(letters)
-            self.canvas.draw_idle()
-
-            if i + 1 < steps:
-                self.parent.after(delay, lambda: step(i + 1))
-            else:
-                self.animating = False
-                self.data = sorted_counts
-                if on_complete:
-                    on_complete()
-        step(0)
-
-    def on_hover(self, event):
-        if event.inaxes != self.ax:
-            self.tooltip.place_forget()
-            return
-
-        hovered = None
-        for bar, (letter, count) in zip(self.bars, self.data):
-            if bar.contains(event)[0]:
-                hovered = bar
-                self.show_tooltip(event, f"{letter}: {count}")
-                self.animate_color(bar, "#5ab4ff")
-            else:
-                self.animate_color(bar, "#3a7bd5")
-
-        if hovered is None:
-            self.tooltip.place_forget()
-
-    def show_tooltip(self, event, text):
-        self.tooltip.config(text=text)
-        x = int(self.parent.winfo_pointerx() - self.parent.winfo_rootx() + 10)
-        y = int(self.parent.winfo_pointery() - self.parent.winfo_rooty() - 10)
-        self.tooltip.place(x=x, y=y)
-
-    def animate_color(self, bar, target_color):
-        start_color = mcolors.to_rgb(bar.get_facecolor())
-        end_color = mcolors.to_rgb(target_color)
-        new_color = tuple(start_color[i] + (end_color[i] - start_color[i]) * 0.5 for i in range(3))
-        bar.set_facecolor(new_color)
-        self.canvas.draw_idle()
+class AnalysisCancelled(Exception):
+    """Raised inside the analysis thread when the user presses Cancel."""
 
 
 class LetterCounterApp(tk.Tk):
-    def __init__(self, debug=False):
+    POLL_MS = 50        ## cât de des verifică UI-ul coada de progres
+
+    def __init__(self, debug=False, workers=None):
         super().__init__()
         self.debug = debug
+        self.workers = workers          ## procese pentru numărare; None = toate nucleele
         self.title("BSI Lp 1")
         self.dir_path = os.path.dirname(os.path.realpath(__file__))
         
         self.sort_mode = tk.IntVar(value=0)
         self.counts = {}
         self.sorted_counts = []
+        self.progress_queue = queue.Queue()
+        self.cancel_event = threading.Event()
 
-        # Initialize both frames
+        # ecranul de rezultate (și matplotlib) se construiește abia când e nevoie de el
+        self.frame_results = None
         self.init_select_frame()
-        self.init_results_frame()
 
         if debug:
             self.geometry("1200x700")
@@ -187,12 +63,20 @@ class LetterCounterApp(tk.Tk):
         """Frame for file selection"""
         self.frame_select = tk.Frame(self)
         tk.Label(self.frame_select, text="Select a text file", font=("Arial", 16)).pack(pady=20)
-        tk.Button(self.frame_select, text="Select File", command=self.select_file, width=20, height=2).pack()
+        self.select_button = tk.Button(self.frame_select, text="Select File", command=self.select_file, width=20, height=2)
+        self.select_button.pack()
         self.file_label = tk.Label(self.frame_select, text="", wraplength=500)
         self.file_label.pack(pady=10)
 
+        self.progress_label = tk.Label(self.frame_select, text="", font=("Segoe UI", 10))
+        self.progress_label.pack(pady=5)
+        self.cancel_button = tk.Button(self.frame_select, text="Cancel", command=self.cancel_event.set, width=10)
+
     def init_results_frame(self):
-        """Frame for results and chart"""
+        """Frame for results and chart, built on first use so the file picker appears without matplotlib."""
+        if self.frame_results is not None:
+            return
+        from chart import InteractiveChart
         self.frame_results = tk.Frame(self)
 
         top_bar = tk.Frame(self.frame_results)
@@ -226,12 +110,14 @@ class LetterCounterApp(tk.Tk):
 
     def show_select(self):
         """Show select frame"""
-        self.frame_results.pack_forget()
+        if self.frame_results is not None:
+            self.frame_results.pack_forget()
         self.geometry("600x400")
         self.frame_select.pack(fill="both", expand=True)
 
     def show_results(self):
         """Show results frame"""
+        self.init_results_frame()
         self.frame_select.pack_forget()
         self.geometry("1200x700")
         self.frame_results.pack(fill="both", expand=True)
@@ -253,25 +139,84 @@ class LetterCounterApp(tk.Tk):
         )
         if file_path:
             self.file_label.config(text=f"Fisierul selectat este:\n{file_path}")
-            self.process_file(file_path)
-            
-            self.show_results()
+            self.start_analysis(file_path)
+
+    def start_analysis(self, file_path):
+        """Runs the counting on a worker thread; the UI polls for progress."""
+        self.cancel_event.clear()
+        self.progress_queue = queue.Queue()
+        self.select_button.config(state="disabled")
+        self.progress_label.config(text="Se analizează...")
+        self.cancel_button.pack(pady=5)
+
+        threading.Thread(target=self.analyze, args=(file_path, self.progress_queue), daemon=True).start()
+        self.after(self.POLL_MS, self.poll_analysis)
+
+    def analyze(self, file_path, progress_queue):
+        """Worker thread: must not touch Tk widgets, only the queue."""
+        size = os.path.getsize(file_path)
+        started = time.perf_counter()
+
+        def report(done):
+            if self.cancel_event.is_set():
+                raise AnalysisCancelled
+            elapsed = time.perf_counter() - started
+            eta = elapsed * (size - done) / done if done else None
+            progress_queue.put(("progress", done, size, eta))
+
+        try:
+            counts = count_letters_parallel(file_path, self.workers, progress=report)
+            progress_queue.put(("done", counts))
+        except AnalysisCancelled:
+            progress_queue.put(("cancelled",))
+        except Exception as e:
+            progress_queue.put(("error", e))
+
+    def poll_analysis(self):
+        """Drains the progress queue on the Tk thread and reschedules itself until the work ends."""
+        try:
+            while True:
+                kind, *payload = self.progress_queue.get_nowait()
+                if kind == "progress":
+                    done, size, eta = payload
+                    text = f"{done / 2**20:.1f} / {size / 2**20:.1f} MB"
+                    if eta is not None:
+                        text += f" · ETA {eta:.0f}s"
+                    self.progress_label.config(text=text)
+                    continue
+
+                self.select_button.config(state="normal")
+                self.cancel_button.pack_forget()
+                if kind == "done":
+                    self.progress_label.config(text="")
+                    self.apply_counts(*payload)
+                    self.show_results()
+                elif kind == "cancelled":
+                    self.progress_label.config(text="Analiză anulată")
+                else:
+                    self.progress_label.config(text=f"Eroare: {payload[0]}")
+                return
+        except queue.Empty:
+            pass
+        self.after(self.POLL_MS, self.poll_analysis)
 
     def process_file(self, file_path):
-        with open(file_path, "r", encoding="utf-8") as file:
-            text = file.read()
-            clean_text = [c.lower() for c in text if c.lower() in "abcdefghijklmnopqrstuvwxyzăâîșț"]
-            self.counts = Counter(clean_text)
-            self.sorted_counts = sorted(self.counts.items(), key=lambda x: x[1], reverse=True)
-
-            # Litere lipsă din alfabetul român
-            self.missing_letters_label.config(
-                text="Litere lipsă: " + ", ".join(
-                    sorted(set("aăâbcdefghiîjklmnopqrsștțuvwxyz") - self.counts.keys())
-                )
+        """Synchronous analysis, used by debug mode."""
+        self.apply_counts(count_letters_parallel(file_path, self.workers))
+
+    def apply_counts(self, counts):
+        self.init_results_frame()
+        self.counts = counts
+        self.sorted_counts = sorted(self.counts.items(), key=lambda x: x[1], reverse=True)
+
+        # Litere lipsă din alfabetul român
+        self.missing_letters_label.config(
+            text="Litere lipsă: " + ", ".join(
+                sorted(set(ROMANIAN_ALPHABET) - self.counts.keys())
             )
+        )
 
-            self.char_count_label.config(text=f"Litere: {self.counts.total()}")
+        self.char_count_label.config(text=f"Litere: {self.counts.total()}")
 
 
     def create_sort_buttons(self, parent):
@@ -1,283 +1,76 @@
-import tkinter as tk, matplotlib.colors as mcolors, os, threading, heapq
+import tkinter as tk, os, threading, queue, time, json, compression
 from tkinter import filedialog, LEFT, RIGHT
 from collections import Counter
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-class TreeCanvas(tk.Frame):
-    def __init__(self, parent, root, title="Arbore"):
-        super().__init__(parent)
-        self.root = root
-
-        # Canvas + Scrollbars
-        self.canvas = tk.Canvas(self, bg="white", width=1200, height=600)
-        self.hbar = tk.Scrollbar(self, orient="horizontal", command=self.canvas.xview)
-        self.vbar = tk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
-        self.canvas.config(xscrollcommand=self.hbar.set, yscrollcommand=self.vbar.set)
-
-        self.canvas.grid(row=0, column=0, sticky="nsew")
-        self.hbar.grid(row=1, column=0, sticky="we")
-        self.vbar.grid(row=0, column=1, sticky="ns")
-        self.grid_rowconfigure(0, weight=1)
-        self.grid_columnconfigure(0, weight=1)
-
-        self.canvas.bind("<MouseWheel>", self.zoom)  # scroll zoom
-        self.scale = 1.0
-
-        self.draw_tree()
-
-    def zoom(self, event):
-        factor = 1.1 if event.delta > 0 else 0.9
-        self.scale *= factor
-        self.canvas.scale("all", 0, 0, factor, factor)
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-
-    def draw_tree(self):
-        canvas = self.canvas
-        canvas.delete("all")
-
-        root = self.root
-        if not root: return
-
-        # 1. Count leaves
-        def count_leaves(node):
-            if node is None: return 0
-            if node.left is None and node.right is None: return 1
-            return count_leaves(node.left) + count_leaves(node.right)
-
-        # 2. Assign positions
-        positions = {}
-        x_step = 60
-        y_step = 80
-        def assign_x(node, depth, next_x):
-            if node is None: return next_x
-            if node.left is None and node.right is None:
-                positions[node] = (next_x * x_step, depth * y_step)
-                return next_x + 1
-            next_x = assign_x(node.left, depth + 1, next_x)
-            next_x = assign_x(node.right, depth + 1, next_x)
-            lx, _ = positions[node.left]
-            rx, _ = positions[node.right]
-            positions[node] = ((lx + rx)/2, depth * y_step)
-            return next_x
-
-        assign_x(root, 0, 1)
-
-        # Normalize margin
-        min_x = min(pos[0] for pos in positions.values())
-        for node in positions:
-            x, y = positions[node]
-            positions[node] = (x - min_x + 50, y + 30)
-
-        # Draw edges (curved)
-        for node, (x, y) in positions.items():
-            if node.left:
-                x2, y2 = positions[node.left]
-                canvas.create_line(x, y, x2, y2, smooth=True)
-            if node.right:
-                x2, y2 = positions[node.right]
-                canvas.create_line(x, y, x2, y2, smooth=True)
-
-        # Draw nodes
-        for node, (x, y) in positions.items():
-            r = 20
-            color = "#cfe6ff" if node.symbol else "#ffddb3"
-            canvas.create_oval(x-r, y-r, x+r, y+r, fill=color, outline="#4a6fa5", width=2)
-            text = f"{node.symbol}\n{node.freq}" if node.symbol else f"{node.freq}"
-            canvas.create_text(x, y, text=text, font=("Arial", 9), justify="center")
-
-class Node:
-    def __init__(self, symbol=None, freq=0, left=None, right=None):
-        self.symbol = symbol
-        self.freq = freq
-        self.left = left
-        self.right = right
-
-    def __lt__(self, other):
-        return self.freq < other.freq
-    
-class BuildCompression:
-    def __init__(self, letters: dict, symbols):
-        self.symbols = symbols
-        self.huffman_root = None
-        self.shannon_root = None
-        self.results_huffman, self.huffman_root = self.build_huffman()
-        self.results_shannon, self.shannon_root = self.build_shannon_fano()
-
-    def build_huffman(self):
-        heap = [Node(c, f) for c, f in self.symbols]
-        heapq.heapify(heap)
-        while len(heap) > 1:
-            left = heapq.heappop(heap)
-            right = heapq.heappop(heap)
-            heapq.heappush(heap, Node(None, left.freq + right.freq, left, right))
-        root = heap[0] if heap else None
-        codes = {}
-        self._build_huffman_codes(root, "", codes)
-        return codes, root
-
-    def _build_huffman_codes(self, node, prefix, codes):
-        if node is None: return
-        if node.symbol is not None:
-            codes[node.symbol] = int(prefix or "0")
-            return
-        self._build_huffman_codes(node.left, prefix + "0", codes)
-        self._build_huffman_codes(node.right, prefix + "1", codes)
-
-    def build_shannon_fano(self):
-        total = sum(f for _, f in self.symbols)
-        probs = [(c, f/total) for c, f in self.symbols]
-        codes = {}
-        self.shannon_root = self._recursive_shannon(probs, codes)
-        return codes, self.shannon_root
-
-    def _recursive_shannon(self, symbols, codes, prefix=""):
-        if len(symbols) == 1:
-            codes[symbols[0][0]] = prefix or "0"
-            return Node(symbols[0][0], round(symbols[0][1], 2))
-        total = sum(p for _, p in symbols)
-        acc, split = 0, 0
-        for i, (_, p) in enumerate(symbols):
-            acc += p
-            if acc >= total/2:
-                split = i+1
-                break
-        left_node = self._recursive_shannon(symbols[:split], codes, prefix+"0")
-        right_node = self._recursive_shannon(symbols[split:], codes, prefix+"1")
-        return Node(None, round(total, 2), left_node, right_node)
+from adaptive import compare_file
+from cache import ResultCache, analysis_variant, pack_analysis, unpack_analysis
+from corpus import Corpus, corpus_files, index_path
+from frequency import FileTail, count_letters_parallel, ROMANIAN_ALPHABET
+from instrument import PROFILE_MODES, STATS, format_snapshot
+
+class BuildCompression(compression.BuildCompression):
+    """BuildCompression plus the Tk windows that draw its trees."""
 
     # ================= SHOW WINDOWS =====================
     def show_huffman_window(self):
+        from treecanvas import TreeCanvas       ## încărcat abia la prima fereastră cu un arbore
         win = tk.Toplevel()
         win.title("Arbore Huffman")
-        TreeCanvas(win, self.huffman_root).pack(fill="both", expand=True)
+        TreeCanvas(win, self.huffman_tree).pack(fill="both", expand=True)
         txt = tk.Text(win, height=5)
         txt.pack(fill="x")
         for k, v in self.results_huffman.items():
             txt.insert("end", f"{k}: {v}\n")
 
     def show_shannon_window(self):
+        from treecanvas import TreeCanvas
         win = tk.Toplevel()
         win.title("Arbore Shannon–Fano")
-        TreeCanvas(win, self.shannon_root).pack(fill="both", expand=True)
+        TreeCanvas(win, self.shannon_tree).pack(fill="both", expand=True)
         txt = tk.Text(win, height=5)
         txt.pack(fill="x")
         for k, v in self.results_shannon.items():
             txt.insert("end", f"{k}: {v}\n")
 
 
-class InteractiveChart:
-    """Chart with smooth height animation and hover tooltip."""
-
-    def __init__(self, parent):
-        self.parent = parent
-        self.figure = Figure(figsize=(8, 3), dpi=100)
-        self.ax = self.figure.add_subplot(111)
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.parent)
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
-
-        self.tooltip = tk.Label(parent, bg="#333", fg="white", padx=5, pady=2, font=("Segoe UI", 10))
-        self.tooltip.place_forget()
-
-        self.bars = []
-        self.data = []
-        self.animating = False
-
-        self.canvas.mpl_connect("motion_notify_event", self.on_hover)
-
-    def draw_chart(self, sorted_counts):
-        """Initial chart draw."""
-        self.ax.clear()
-        letters = [l for l, _ in sorted_counts]
-        counts = [c for _, c in sorted_counts]
-
-        self.bars = self.ax.bar(letters, counts, color="#3a7bd5")
-        self.data = sorted_counts
-
-        self.ax.set_xlabel("Litere")
-        self.ax.set_ylabel("Total")
-        self.ax.set_title("Frecventa de aparitie")
-        self.ax.grid(True, linestyle="--", alpha=0.5)
-        self.canvas.draw()
-
-    def update_chart_smooth(self, sorted_counts, steps=10, delay=30, on_complete=None):
-        if self.animating: return 
-
-        if not self.bars or len(self.bars) != len(sorted_counts):
-            self.draw_chart(sorted_counts)
-            if on_complete:
-                on_complete()
-            return
-
-        current_heights = [bar.get_height() for bar in self.bars]
-        new_heights = [c for _, c in sorted_counts]
-        letters = [l for l, _ in sorted_counts]
-
-        self.animating = True
-
-        def step(i):
-            factor = (i + 1) / steps
-            for bar, h_old, h_new in zip(self.bars, current_heights, new_heights):
-                bar.set_height(h_old + (h_new - h_old) * factor)
-
-            self.ax.set_xticks(range(len(letters)))
-            self.ax.set_xticklabels(letters)
-            self.canvas.draw_idle()
-
-            if i + 1 < steps:
-                self.parent.after(delay, lambda: step(i + 1))
-            else:
-                self.animating = False
-                self.data = sorted_counts
-                if on_complete:
-                    on_complete()
-        step(0)
-
-    def on_hover(self, event):
-        if event.inaxes != self.ax:
-            self.tooltip.place_forget()
-            return
-
-        hovered = None
-        for bar, (letter, count) in zip(self.bars, self.data):
-            if bar.contains(event)[0]:
-                hovered = bar
-                self.show_tooltip(event, f"{letter}: {count}")
-                self.animate_color(bar, "#5ab4ff")
-            else:
-                self.animate_color(bar, "#3a7bd5")
-
-        if hovered is None:
-            self.tooltip.place_forget()
-
-    def show_tooltip(self, event, text):
-        self.tooltip.config(text=text)
-        x = int(self.parent.winfo_pointerx() - self.parent.winfo_rootx() + 10)
-        y = int(self.parent.winfo_pointery() - self.parent.winfo_rooty() - 10)
-        self.tooltip.place(x=x, y=y)
-
-    def animate_color(self, bar, target_color):
-        start_color = mcolors.to_rgb(bar.get_facecolor())
-        end_color = mcolors.to_rgb(target_color)
-        new_color = tuple(start_color[i] + (end_color[i] - start_color[i]) * 0.5 for i in range(3))
-        bar.set_facecolor(new_color)
-        self.canvas.draw_idle()
+class AnalysisCancelled(Exception):
+    """Raised inside the analysis thread when the user presses Cancel."""
 
 
 class LetterCounterApp(tk.Tk):
-    def __init__(self, debug=False):
+    POLL_MS = 50        ## cât de des verifică UI-ul coada de progres
+    WATCH_SECONDS = 1.0     ## cât de des se uită modul urmărire după octeți noi
+    DEBUG_REFRESH_MS = 500  ## reîmprospătarea panoului de instrumentare
+
+    def __init__(self, debug=False, workers=None, use_cache=True, instrument=False):
         super().__init__()
         self.debug = debug
+        STATS.enable(instrument)
+        self.instrumenting = tk.BooleanVar(value=instrument)
+        self.profile_mode = tk.StringVar(value="")      ## "" = fără cProfile/tracemalloc
+        self.debug_window = None
+        self.workers = workers          ## procese pentru numărare; None = toate nucleele
+        try:
+            self.cache = ResultCache() if use_cache else None
+        except OSError:
+            self.cache = None           ## ex. fără drept de scriere în ~/.cache: doar fără cache
         self.title("BSI Lp 1")
         self.dir_path = os.path.dirname(os.path.realpath(__file__))
         
         self.sort_mode = tk.IntVar(value=0)
         self.counts = {}
         self.sorted_counts = []
-
-        # Initialize both frames
+        self.progress_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.file_path = None
+        self.corpus = None              ## defalcarea pe fișiere, doar în modul corpus
+        self.watch_queue = queue.Queue()
+        self.watch_stop = None          ## Event-ul firului de urmărire activ
+        self.watch_tail = None          ## FileTail pornit din numărătoarea ultimei analize
+        self.watching = tk.BooleanVar(value=False)
+
+        # ecranul de rezultate (și matplotlib) se construiește abia când e nevoie de el
+        self.frame_results = None
         self.init_select_frame()
-        self.init_results_frame()
 
         if debug:
             self.geometry("1200x700")
@@ -291,12 +84,23 @@ class LetterCounterApp(tk.Tk):
         """Frame for file selection"""
         self.frame_select = tk.Frame(self)
         tk.Label(self.frame_select, text="Select a text file", font=("Arial", 16)).pack(pady=20)
-        tk.Button(self.frame_select, text="Select File", command=self.select_file, width=20, height=2).pack()
+        self.select_button = tk.Button(self.frame_select, text="Select File", command=self.select_file, width=20, height=2)
+        self.select_button.pack()
+        self.folder_button = tk.Button(self.frame_select, text="Select Folder", command=self.select_folder, width=20, height=2)
+        self.folder_button.pack(pady=5)
+        tk.Button(self.frame_select, text="Instrumentare", command=self.show_debug_panel, width=12).pack(pady=5)
         self.file_label = tk.Label(self.frame_select, text="", wraplength=500)
         self.file_label.pack(pady=10)
 
+        self.progress_label = tk.Label(self.frame_select, text="", font=("Segoe UI", 10))
+        self.progress_label.pack(pady=5)
+        self.cancel_button = tk.Button(self.frame_select, text="Cancel", command=self.cancel_event.set, width=10)
+
     def init_results_frame(self):
-        """Frame for results and chart"""
+        """Frame for results and chart, built on first use so the file picker appears without matplotlib."""
+        if self.frame_results is not None:
+            return
+        from chart import InteractiveChart
         self.frame_results = tk.Frame(self)
 
         top_bar = tk.Frame(self.frame_results)
@@ -313,6 +117,10 @@ class LetterCounterApp(tk.Tk):
         # Missing letters on the right
         self.missing_letters_label = tk.Label(top_bar, text="", fg="red", font=("Segoe UI", 10))
         self.missing_letters_label.pack(side="right", padx=15)
+
+        tk.Checkbutton(top_bar, text="Urmărește fișierul", variable=self.watching,
+                       command=self.toggle_watch).pack(side="right", padx=5)
+        tk.Button(top_bar, text="Instrumentare", command=self.show_debug_panel).pack(side="right", padx=5)
         
         text_row = tk.Frame(self.frame_results)
         text_row.pack(fill="x", padx=10, pady=5)
@@ -330,21 +138,27 @@ class LetterCounterApp(tk.Tk):
 
     def show_select(self):
         """Show select frame"""
-        self.frame_results.pack_forget()
+        if self.frame_results is not None:
+            self.frame_results.pack_forget()
         self.geometry("600x400")
         self.frame_select.pack(fill="both", expand=True)
 
     def show_results(self):
         """Show results frame"""
+        self.init_results_frame()
         self.frame_select.pack_forget()
         self.geometry("1200x700")
         self.frame_results.pack(fill="both", expand=True)
+        self.refresh_results()
+
+    def refresh_results(self):
+        """Redraws the probabilities and the chart from self.sorted_counts."""
         total_chars = sum(self.counts.values())
 
 
         def update_text():
             self.results_text.delete("1.0", tk.END)
-            for letter, count in self.sorted_counts:
+            for letter, count in (self.sorted_counts if total_chars else []):
                 prob = count / total_chars
                 self.results_text.insert(tk.END, f"{letter}: {prob:.4f}\n")
 
@@ -357,28 +171,188 @@ class LetterCounterApp(tk.Tk):
         )
         if file_path:
             self.file_label.config(text=f"Fisierul selectat este:\n{file_path}")
-            self.process_file(file_path)
-            
-            self.show_results()
+            self.start_analysis(file_path)
+
+    def select_folder(self):
+        folder = filedialog.askdirectory(title="Selecteaza un director cu fisiere .txt")
+        if folder:
+            self.file_label.config(text=f"Corpusul selectat este:\n{folder}")
+            self.start_analysis(folder, corpus=True)
+
+    def start_analysis(self, file_path, corpus=False):
+        """Runs counting and code construction on a worker thread; the UI polls for progress."""
+        self.stop_watch()
+        self.file_path = None if corpus else file_path      ## un corpus nu poate fi urmărit
+        self.cancel_event.clear()
+        self.progress_queue = queue.Queue()
+        self.select_button.config(state="disabled")
+        self.folder_button.config(state="disabled")
+        self.progress_label.config(text="Se analizează...")
+        self.cancel_button.pack(pady=5)
+
+        target = self.analyze_corpus if corpus else self.analyze
+        profile = self.profile_mode.get() or None       ## variabilele Tk se citesc doar pe firul UI
+        threading.Thread(target=target, args=(file_path, self.progress_queue, profile), daemon=True).start()
+        self.after(self.POLL_MS, self.poll_analysis)
+
+    def analyze(self, file_path, progress_queue, profile=None):
+        """Worker thread: must not touch Tk widgets, only the queue.
+
+        `profile` ("cprofile"/"tracemalloc") captures this analysis for the debug panel.
+        """
+        size = os.path.getsize(file_path)
+        started = time.perf_counter()
+
+        def report(done):
+            if self.cancel_event.is_set():
+                raise AnalysisCancelled
+            elapsed = time.perf_counter() - started
+            eta = elapsed * (size - done) / done if done else None
+            progress_queue.put(("progress", done, size, eta))
+
+        try:
+            with STATS.capture(profile):
+                counts, sorted_counts, compression = self.load_analysis(file_path, progress=report)
+            report(size)
+            progress_queue.put(("done", counts, sorted_counts, compression))
+        except AnalysisCancelled:
+            progress_queue.put(("cancelled",))
+        except Exception as e:
+            progress_queue.put(("error", e))
+
+    def analyze_corpus(self, folder, progress_queue, profile=None):
+        """Worker thread for a directory: counts its .txt files on a process pool and merges them.
+
+        The per-file breakdown is kept in the cache directory, so files that did not change
+        are not recounted next time, even after a cancel.
+        """
+        def report(done, total):
+            if self.cancel_event.is_set():
+                raise AnalysisCancelled
+            progress_queue.put(("files", done, total))
+
+        saved = index_path([folder], self.cache.directory) if self.cache else None
+        corpus = Corpus.load(saved) if saved else Corpus()
+        try:
+            with STATS.capture(profile):
+                try:
+                    corpus.update(corpus_files(folder), self.workers, progress=report)
+                finally:
+                    if saved:
+                        corpus.save(saved)
+                counts = corpus.counts
+                with STATS.timer("sort"):
+                    sorted_counts = sorted(counts.items(), key=lambda x: x[1], reverse=True)
+                compression = BuildCompression(counts, sorted_counts)
+            progress_queue.put(("done", counts, sorted_counts, compression, corpus))
+        except AnalysisCancelled:
+            progress_queue.put(("cancelled",))
+        except Exception as e:
+            progress_queue.put(("error", e))
+
+    def poll_analysis(self):
+        """Drains the progress queue on the Tk thread and reschedules itself until the work ends."""
+        try:
+            while True:
+                kind, *payload = self.progress_queue.get_nowait()
+                if kind == "progress":
+                    done, size, eta = payload
+                    text = f"{done / 2**20:.1f} / {size / 2**20:.1f} MB"
+                    if eta is not None:
+                        text += f" · ETA {eta:.0f}s"
+                    self.progress_label.config(text=text)
+                    continue
+                if kind == "files":
+                    done, total = payload
+                    self.progress_label.config(text=f"{done} / {total} fișiere")
+                    continue
+
+                self.select_button.config(state="normal")
+                self.folder_button.config(state="normal")
+                self.cancel_button.pack_forget()
+                if kind == "done":
+                    self.progress_label.config(text="")
+                    self.apply_counts(*payload)
+                    self.show_results()
+                elif kind == "cancelled":
+                    self.progress_label.config(text="Analiză anulată")
+                else:
+                    self.progress_label.config(text=f"Eroare: {payload[0]}")
+                return
+        except queue.Empty:
+            pass
+        self.after(self.POLL_MS, self.poll_analysis)
 
     def process_file(self, file_path):
-        with open(file_path, "r", encoding="utf-8") as file:
-            text = file.read()
-            clean_text = [c.lower() for c in text if c.lower() in "abcdefghijklmnopqrstuvwxyzăâîșț"]
-            self.counts = Counter(clean_text)
-            self.sorted_counts = sorted(self.counts.items(), key=lambda x: x[1], reverse=True)
-
-            # Litere lipsă din alfabetul român
-            self.missing_letters_label.config(
-                text="Litere lipsă: " + ", ".join(
-                    sorted(set("aăâbcdefghiîjklmnopqrsștțuvwxyz") - self.counts.keys())
-                )
+        """Synchronous analysis, used by debug mode."""
+        self.file_path = file_path
+        self.apply_counts(*self.load_analysis(file_path))
+
+    def load_analysis(self, file_path, progress=None):
+        """(counts, sorted_counts, compression) of a file; content seen before comes from the cache.
+
+        Also keeps a FileTail seeded with these counts, so watch mode starts after the
+        bytes counted here instead of reading the whole file again.
+        """
+        version = FileTail.version(file_path)
+        analysis = self._load_analysis(file_path, progress)
+        self.watch_tail = FileTail.after_count(file_path, analysis[0], version)
+        return analysis
+
+    def _load_analysis(self, file_path, progress=None):
+        def build(path):
+            counts = count_letters_parallel(path, self.workers, progress=progress)
+            with STATS.timer("sort"):
+                sorted_counts = sorted(counts.items(), key=lambda x: x[1], reverse=True)
+            return counts, sorted_counts, BuildCompression(counts, sorted_counts)
+
+        if self.cache is None:
+            return build(file_path)
+        entry = self.cache.get(file_path, lambda path: pack_analysis(*build(path)), analysis_variant())
+        return unpack_analysis(entry, BuildCompression)
+
+    def apply_counts(self, counts, sorted_counts, compression, corpus=None):
+        self.init_results_frame()
+        self.counts = counts
+        self.sorted_counts = sorted_counts
+
+        # Litere lipsă din alfabetul român
+        self.missing_letters_label.config(
+            text="Litere lipsă: " + ", ".join(
+                sorted(set(ROMANIAN_ALPHABET) - self.counts.keys())
             )
+        )
 
-            self.char_count_label.config(text=f"Litere: {self.counts.total()}")
-            self.compression = BuildCompression(self.counts, self.sorted_counts)
-            self.create_compression_buttons()
+        self.char_count_label.config(text=f"Litere: {self.counts.total()}")
+        self.compression = compression
+        self.corpus = corpus
+        self.show_coder_comparison()
+        self.create_compression_buttons()
+        if corpus:
+            self.corpus_button.pack(side=tk.LEFT, padx=10)
+        else:
+            self.corpus_button.pack_forget()
             
+    def show_coder_comparison(self):
+        """Bits/letter of rANS, Huffman and Shannon–Fano next to the entropy, in the right-hand text box.
+
+        "model" is the payload cost alone; "flux" adds the fixed header of a real stream.
+        """
+        self.shanon_text.delete("1.0", tk.END)
+        if not self.counts:
+            return
+        comparison = self.compression.coder_comparison()
+        entropy = comparison["entropy_bits_per_letter"]
+        self.shanon_text.insert(tk.END, f"entropie Shannon {entropy:.4f} biți/literă\n\n")
+        self.shanon_text.insert(tk.END, f"{'':14s} {'model':>8s} {'antet':>8s} {'flux':>8s}\n")
+        for name, key in (("rANS", "rans"), ("Huffman", "huffman"), ("Shannon–Fano", "shannon_fano")):
+            cost = comparison[key]
+            if cost is None:
+                continue
+            header = "-" if cost["header_bytes"] is None else f"{cost['header_bytes']} B"
+            stream = "-" if cost["stream_bits_per_letter"] is None else f"{cost['stream_bits_per_letter']:.4f}"
+            self.shanon_text.insert(tk.END, f"{name:14s} {cost['payload_bits_per_letter']:8.4f} {header:>8s} {stream:>8s}\n")
+
     def create_sort_buttons(self, parent):
         sort_frame = tk.Frame(parent)
         sort_frame.pack(pady=10)
@@ -399,26 +373,194 @@ class LetterCounterApp(tk.Tk):
         self.compression_btn_frame.pack(pady=10)
 
         tk.Button(self.compression_btn_frame, text="Arbore Huffman", width=20, height=2,
-                  command=self.compression.show_huffman_window).pack(side=tk.LEFT, padx=10)
+                  command=lambda: self.compression.show_huffman_window()).pack(side=tk.LEFT, padx=10)
 
         tk.Button(self.compression_btn_frame, text="Arbore Shannon–Fano", width=20, height=2,
-                  command=self.compression.show_shannon_window).pack(side=tk.LEFT, padx=10)
-
-    def update_sort(self):
+                  command=lambda: self.compression.show_shannon_window()).pack(side=tk.LEFT, padx=10)
+
+        tk.Button(self.compression_btn_frame, text="Huffman adaptiv", width=20, height=2,
+                  command=self.show_adaptive_window).pack(side=tk.LEFT, padx=10)
+
+        self.corpus_button = tk.Button(self.compression_btn_frame, text="Fișiere corpus", width=20, height=2,
+                                       command=self.show_corpus_window)
+
+    def show_corpus_window(self):
+        """Per-file breakdown of the corpus, read from memory (nothing is recounted)."""
+        win = tk.Toplevel(self)
+        win.title(f"Corpus: {len(self.corpus.files)} fișiere")
+        txt = tk.Text(win, width=110, height=30)
+        txt.pack(fill="both", expand=True)
+        rows = sorted(self.corpus.files.items(), key=lambda x: x[1][2].total(), reverse=True)
+        txt.insert("end", "\n".join(
+            f"{counts.total():>10}  {path}  ({', '.join(f'{l}: {c}' for l, c in counts.most_common(5))})"
+            for path, (_, _, counts) in rows))
+
+    def show_adaptive_window(self):
+        """Single-pass adaptive Huffman vs. the static code from self.counts, coded on a worker thread."""
+        win = tk.Toplevel(self)
+        win.title("Huffman adaptiv vs. static")
+        txt = tk.Text(win, width=60, height=6, font=("Courier", 10))
+        txt.pack(fill="both", expand=True)
+        if not self.file_path:
+            txt.insert("end", "Disponibil doar pentru un fișier, nu pentru un corpus.")
+            return
+        txt.insert("end", "Se codează fișierul...")
+        results = queue.Queue()
+        path, counts = self.file_path, Counter(self.counts)
+
+        def work():
+            try:
+                results.put(compare_file(path, counts))
+            except Exception as e:
+                results.put(e)
+
+        def poll():
+            try:
+                result = results.get_nowait()
+            except queue.Empty:
+                self.after(self.POLL_MS, poll)
+                return
+            if not win.winfo_exists():
+                return
+            txt.delete("1.0", "end")
+            if isinstance(result, Exception):
+                txt.insert("end", f"Eroare: {result}")
+                return
+            txt.insert("end", f"{'':16s} {'biți/literă':>12s} {'octeți':>10s} {'MB/s':>8s}\n")
+            for name, key in (("Huffman static", "static_huffman"), ("Huffman adaptiv", "adaptive_huffman")):
+                stats = result[key]
+                txt.insert("end", f"{name:16s} {stats['bits_per_letter']:12.4f} {stats['bytes']:10d} {stats['mb_s']:8.2f}\n")
+
+        threading.Thread(target=work, daemon=True).start()
+        self.after(self.POLL_MS, poll)
+
+    def sort_counts(self):
+        with STATS.timer("sort"):
+            return self._sort_counts()
+
+    def _sort_counts(self):
         match self.sort_mode.get():
             case 0:
-                self.sorted_counts = sorted(self.counts.items(), key=lambda x: x[1], reverse=True)
+                return sorted(self.counts.items(), key=lambda x: x[1], reverse=True)
             case 1:
-                self.sorted_counts = sorted(self.counts.items(), key=lambda x: x[1])
+                return sorted(self.counts.items(), key=lambda x: x[1])
             case 2:
-                self.sorted_counts = sorted(self.counts.items(), key=lambda x: x[0])
+                return sorted(self.counts.items(), key=lambda x: x[0])
             case 3:
-                self.sorted_counts = sorted(self.counts.items(), key=lambda x: x[0], reverse=True)
-            case _: pass
+                return sorted(self.counts.items(), key=lambda x: x[0], reverse=True)
+            case _:
+                return self.sorted_counts
 
+    def update_sort(self):
+        self.sorted_counts = self.sort_counts()
         self.show_results()
 
+    # ================= INSTRUMENTATION =====================
+    def show_debug_panel(self):
+        """Stage timers and counters (read, decode, count, sort, huffman, shannon, draw), refreshed live.
+
+        The profiling choice applies to the next analysis that is started.
+        """
+        if self.debug_window is not None and self.debug_window.winfo_exists():
+            self.debug_window.lift()
+            return
+        win = self.debug_window = tk.Toplevel(self)
+        win.title("Instrumentare")
+        options = tk.Frame(win)
+        options.pack(fill="x", padx=5, pady=5)
+        tk.Checkbutton(options, text="Activă", variable=self.instrumenting,
+                       command=lambda: STATS.enable(self.instrumenting.get())).pack(side=LEFT)
+        tk.Label(options, text="Profilare:").pack(side=LEFT, padx=(15, 5))
+        for text, mode in (("fără", ""), *((mode, mode) for mode in PROFILE_MODES)):
+            tk.Radiobutton(options, text=text, variable=self.profile_mode, value=mode).pack(side=LEFT)
+        tk.Button(options, text="Salvează JSON", command=self.save_instrumentation).pack(side=RIGHT, padx=5)
+        tk.Button(options, text="Resetează", command=STATS.reset).pack(side=RIGHT)
+
+        self.debug_text = tk.Text(win, width=90, height=30, font=("Courier", 10))
+        self.debug_text.pack(fill="both", expand=True)
+        self.refresh_debug_panel()
+
+    def refresh_debug_panel(self):
+        if self.debug_window is None or not self.debug_window.winfo_exists():
+            self.debug_window = None
+            return
+        text = format_snapshot(STATS.snapshot())
+        if text != self.debug_text.get("1.0", "end-1c"):     ## altfel derularea ar sări la început
+            self.debug_text.delete("1.0", tk.END)
+            self.debug_text.insert(tk.END, text)
+        self.after(self.DEBUG_REFRESH_MS, self.refresh_debug_panel)
+
+    def save_instrumentation(self):
+        path = filedialog.asksaveasfilename(title="Salvează instrumentarea", defaultextension=".json",
+                                            filetypes=(("JSON", "*.json"),), parent=self.debug_window)
+        if path:
+            with open(path, "w", encoding="utf-8") as out:
+                json.dump(STATS.snapshot(), out, ensure_ascii=False, indent=2)
+
+    # ================= WATCH MODE =====================
+    def toggle_watch(self):
+        if self.watching.get() and self.file_path:
+            self.start_watch()
+        else:
+            self.stop_watch()
+
+    def start_watch(self):
+        """Follows the analysed file on a worker thread; only appended bytes are counted."""
+        self.stop_watch()
+        self.watching.set(True)
+        self.watch_stop = threading.Event()
+        self.watch_queue = queue.Queue()
+        seeded = self.watch_tail is not None and self.watch_tail.file_path == self.file_path
+        tail = self.watch_tail.copy() if seeded else FileTail(self.file_path)   ## un fir oprit poate încă folosi altul
+        threading.Thread(target=self.watch, args=(tail, self.watch_stop, self.watch_queue), daemon=True).start()
+        self.after(self.POLL_MS, self.poll_watch, self.watch_stop)
+
+    def stop_watch(self):
+        if self.watch_stop is not None:
+            self.watch_stop.set()
+            self.watch_stop = None
+        self.watching.set(False)
+
+    def watch(self, tail, stop, watch_queue):
+        """Worker thread: polls the file and sends (counts, sorted_counts, compression) when they change."""
+        while not stop.is_set():
+            try:
+                added, rescanned = tail.poll()
+            except OSError as e:
+                watch_queue.put(("error", e))
+                return
+            if added or rescanned:
+                counts = tail.counts.copy()
+                sorted_counts = sorted(counts.items(), key=lambda x: x[1], reverse=True)
+                watch_queue.put(("update", counts, sorted_counts, BuildCompression(counts, sorted_counts)))
+            stop.wait(self.WATCH_SECONDS)
+
+    def poll_watch(self, stop):
+        """Applies the newest watch update on the Tk thread; older queued ones are skipped."""
+        if stop is not self.watch_stop:
+            return          ## urmărirea s-a oprit sau a repornit între timp
+        latest = None
+        try:
+            while True:
+                latest = self.watch_queue.get_nowait()
+        except queue.Empty:
+            pass
+
+        if latest is not None and latest[0] == "error":
+            self.stop_watch()
+            self.char_count_label.config(text=f"Urmărire oprită: {latest[1]}")
+            return
+        if latest is not None and self.chart_widget.animating:
+            self.watch_queue.put(latest)        ## reîncearcă după animația curentă
+        elif latest is not None:
+            self.apply_counts(*latest[1:])
+            self.sorted_counts = self.sort_counts()
+            if self.frame_results.winfo_ismapped():
+                self.refresh_results()
+        self.after(self.POLL_MS, self.poll_watch, stop)
+
     def go_back(self):
+        self.stop_watch()
         self.show_select()
 
 
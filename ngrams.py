@@ -0,0 +1,143 @@
+import math, sys
+from array import array
+from collections import Counter
+from compression import BuildCompression, average_code_length
+from frequency import ALPHABET, CHUNK_SIZE, is_utf8, letter_indices, mapped_windows
+
+LETTERS = len(ALPHABET)
+MAX_ORDER = 4
+PAD = 0xFF              ## niciodată un index de literă
+
+
+class NgramTable:
+    """Counts of letter n-grams in a dense array of 31**n cells (cell = n-gram in base 31)."""
+
+    def __init__(self, n):
+        self.n = n
+        self.cells = array("Q", bytes(8 * LETTERS ** n))
+
+    def total(self) -> int:
+        return sum(self.cells)
+
+    def ngram(self, cell) -> str:
+        letters = []
+        for _ in range(self.n):
+            cell, digit = divmod(cell, LETTERS)
+            letters.append(ALPHABET[digit])
+        return "".join(reversed(letters))
+
+    def cell(self, ngram) -> int:
+        cell = 0
+        for letter in ngram:
+            cell = cell * LETTERS + ALPHABET.index(letter)
+        return cell
+
+    def __getitem__(self, ngram) -> int:
+        return self.cells[self.cell(ngram)]
+
+    def symbols(self) -> list[tuple[str, int]]:
+        """(n-gram, count) for every n-gram seen, most frequent first, ready for BuildCompression."""
+        seen = [(self.ngram(cell), count) for cell, count in enumerate(self.cells) if count]
+        return sorted(seen, key=lambda x: x[1], reverse=True)
+
+    def entropy(self) -> float:
+        """Shannon entropy of the n-gram distribution, in bits per n-gram."""
+        total = self.total()
+        return -sum(c / total * math.log2(c / total) for c in self.cells if c) if total else 0.0
+
+
+class NgramCounter:
+    """Streams letter indices and counts their n-grams for several orders (n <= 4) at once.
+
+    N-grams run over the letter stream the coders see: everything that is not a letter
+    is dropped first, so "a, b" gives the bigram "ab". Every chunk is read once as
+    machine words starting at each offset, so one C-level Counter pass yields the
+    1..4 letter prefixes of every position; each order is then folded out of it.
+    The last letters of a chunk are carried into the next one, so no n-gram is lost
+    at a boundary.
+    """
+
+    def __init__(self, orders=(2, 3)):
+        self.orders = sorted(set(orders))
+        if not self.orders or self.orders[0] < 1 or self.orders[-1] > MAX_ORDER:
+            raise ValueError(f"ordinele n-gramelor trebuie să fie între 1 și {MAX_ORDER}")
+        self.tables = {n: NgramTable(n) for n in self.orders}
+        self.code = "H" if self.orders[-1] <= 2 else "I"
+        self.width = array(self.code).itemsize
+        self.carry = b""
+
+    def add(self, indices):
+        """Counts the n-grams ending in `indices` (letter_indices output)."""
+        data = self.carry + indices
+        counted = len(self.carry)       ## n-gramele din întregime în carry au fost numărate deja
+        self.carry = data[-(self.orders[-1] - 1):] if self.orders[-1] > 1 else b""
+        if not data:
+            return
+
+        width = self.width
+        padded = data + bytes([PAD]) * (width - 1)      ## fiecare poziție începe un cuvânt întreg
+        words = Counter()
+        for offset in range(width):
+            usable = (len(padded) - offset) // width * width
+            words.update(memoryview(padded)[offset:offset + usable].cast(self.code))
+
+        tables = [(n, self.tables[n].cells) for n in self.orders]
+        for word, count in words.items():
+            cell = 0
+            for n, digit in enumerate(word.to_bytes(width, sys.byteorder)[:self.orders[-1]], 1):
+                if digit == PAD:
+                    break
+                cell = cell * LETTERS + digit
+                for order, cells in tables:
+                    if order == n:
+                        cells[cell] += count
+
+        for n, cells in tables:
+            for start in range(counted - n + 1):
+                cells[self.tables[n].cell(letters_of(data[start:start + n]))] -= 1
+
+    def add_text(self, text):
+        self.add(letter_indices(text.encode()))
+
+
+def letters_of(indices) -> str:
+    return "".join(ALPHABET[i] for i in indices)
+
+
+def count_ngrams(file_path, orders=(2, 3), window=CHUNK_SIZE, encoding="utf-8") -> dict[int, NgramTable]:
+    """N-gram tables of a file for every n in `orders`, in one pass of `window` bytes at a time.
+
+    UTF-8 is scanned through mmap without decoding; other encodings are read as text.
+    """
+    counter = NgramCounter(orders)
+    if not is_utf8(encoding):
+        with open(file_path, "r", encoding=encoding) as file:
+            while chunk := file.read(window):
+                counter.add_text(chunk)
+        return counter.tables
+    for data in mapped_windows(file_path, window=window):
+        counter.add(letter_indices(data))
+    return counter.tables
+
+
+def coding_comparison(tables: dict[int, NgramTable]) -> dict[int, dict]:
+    """Bits per letter of Huffman and Shannon–Fano codes built over n-gram symbols.
+
+    A code over n-grams spends its average code length on n letters; the n-gram
+    entropy divided by n is the bound those codes approach.
+    """
+    report = {}
+    for n, table in sorted(tables.items()):
+        symbols = table.symbols()
+        if not symbols:
+            continue
+        compression = BuildCompression(dict(symbols), symbols)
+        shannon_lengths = {s: len(code) for s, code in compression.results_shannon.items()}
+        report[n] = {
+            "symbols": len(symbols),
+            "entropy_bits_per_letter": table.entropy() / n,
+            "huffman_bits_per_letter": average_code_length(compression.huffman_tree.code_lengths(), symbols) / n,
+            "shannon_fano_bits_per_letter": average_code_length(shannon_lengths, symbols) / n,
+            "top": symbols[:20],
+        }
+    return report
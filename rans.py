@@ -0,0 +1,133 @@
+"""rANS (range Asymmetric Numeral Systems) coder over ALPHABET, a third backend next to Huffman and Shannon–Fano.
+
+Letter counts are quantized to frequencies that sum to 2**PROB_BITS, so a letter costs
+log2(2**PROB_BITS / freq) bits instead of a whole number of bits. STREAMS states are
+interleaved: letter i is coded by state i % STREAMS, and every state writes to the
+same byte stream.
+"""
+import math, struct
+from frequency import ALPHABET, index_letters, letter_indices
+
+PROB_BITS = 14                  ## totalul frecvențelor cuantizate: 2**14
+LOWER = 1 << 23                 ## starea rămâne în [LOWER, LOWER * 256), deci încape în 32 de biți
+STREAMS = 4
+TABLE = struct.Struct(f">{len(ALPHABET)}H")     ## frecvența cuantizată a fiecărei litere (0 = lipsește)
+STREAM_HEADER = struct.Struct(">BQ")            ## stări intercalate, numărul de litere
+STATE = struct.Struct(">I")
+
+
+def quantize(counts, bits=PROB_BITS) -> dict[str, int]:
+    """Frequencies proportional to `counts` that sum to 2**bits; every letter that occurs keeps at least 1."""
+    present = {letter: count for letter, count in counts.items() if count}
+    total, scale = sum(present.values()), 1 << bits
+    if not present:
+        return {}
+    if len(present) > scale:
+        raise ValueError(f"{len(present)} simboluri nu încap în 2**{bits}")
+    freqs = {letter: max(1, count * scale // total) for letter, count in present.items()}
+    missing = scale - sum(freqs.values())
+    # sloturile rămase la literele cu cel mai mare rest al împărțirii (cel mult una per literă)
+    by_remainder = sorted(present, key=lambda l: (present[l] * scale % total, present[l]), reverse=True)
+    for letter in by_remainder[:max(missing, 0)]:
+        freqs[letter] += 1
+    # max(1, ...) poate depăși totalul: se ia înapoi de la literele cele mai frecvente
+    while missing < 0:
+        for letter in sorted(freqs, key=freqs.get, reverse=True):
+            if missing == 0:
+                break
+            if freqs[letter] > 1:
+                freqs[letter] -= 1
+                missing += 1
+    return freqs
+
+
+class RansCoder:
+    """Byte-wise rANS with STREAMS interleaved 32-bit states.
+
+    Stream layout: TABLE, STREAM_HEADER, the final state of every stream (stream 0
+    first), then the renormalization bytes in the order the decoder reads them.
+    """
+    def __init__(self, freqs: dict[str, int], streams=STREAMS):
+        self.freqs = freqs
+        self.streams = streams
+        self._freq = [freqs.get(letter, 0) for letter in ALPHABET]
+        self._start = [0] * len(ALPHABET)
+        self._slots = bytearray()           ## slot din [0, 2**PROB_BITS) -> indexul literei
+        for i, freq in enumerate(self._freq):
+            self._start[i] = len(self._slots)
+            self._slots += bytes([i]) * freq
+        if freqs and len(self._slots) != 1 << PROB_BITS:
+            raise ValueError("Frecvențele trebuie să aibă suma 2**PROB_BITS")
+        ## peste această stare o literă cu frecvența f nu mai încape fără a scoate un octet
+        self._limit = [((LOWER >> PROB_BITS) << 8) * freq for freq in self._freq]
+
+    @classmethod
+    def from_counts(cls, counts, streams=STREAMS) -> "RansCoder":
+        return cls(quantize(counts), streams)
+
+    @classmethod
+    def from_stream(cls, data) -> "RansCoder":
+        freqs = {letter: freq for letter, freq in zip(ALPHABET, TABLE.unpack_from(data)) if freq}
+        return cls(freqs, STREAM_HEADER.unpack_from(data, TABLE.size)[0])
+
+    def expected_bits_per_letter(self, counts) -> float:
+        """Payload bits/letter of `counts` under the quantized table (the few flush bytes aside)."""
+        total = sum(counts.values())
+        bits = sum(count * (PROB_BITS - math.log2(self.freqs[letter])) for letter, count in counts.items() if count)
+        return bits / total if total else 0.0
+
+    def header_bytes(self) -> int:
+        """TABLE, STREAM_HEADER and the final states: the part of a stream that does not grow with the text."""
+        return TABLE.size + STREAM_HEADER.size + self.streams * STATE.size
+
+    def encode(self, text) -> bytes:
+        """Encodes the letters of `text` (str, or UTF-8 bytes/bytearray)."""
+        indices = letter_indices(text.encode() if isinstance(text, str) else text)
+        freq, start, limit, streams = self._freq, self._start, self._limit, self.streams
+        missing = sorted(ALPHABET[i] for i in set(indices) if not freq[i])
+        if missing:
+            raise ValueError(f"Litere fără frecvență rANS: {', '.join(missing)}")
+
+        # rANS e LIFO: literele se codează de la ultima la prima, iar octeții se inversează la final
+        states, out = [LOWER] * streams, bytearray()
+        for i in range(len(indices) - 1, -1, -1):
+            s, j = indices[i], i % streams
+            x = states[j]
+            while x >= limit[s]:
+                out.append(x & 0xFF)
+                x >>= 8
+            q, r = divmod(x, freq[s])
+            states[j] = (q << PROB_BITS) + r + start[s]
+        for x in reversed(states):
+            out += x.to_bytes(STATE.size, "little")     ## inversat devine big-endian, starea 0 prima
+        out.reverse()
+        return TABLE.pack(*freq) + STREAM_HEADER.pack(streams, len(indices)) + bytes(out)
+
+    def decode(self, data) -> str:
+        streams, count = STREAM_HEADER.unpack_from(data, TABLE.size)
+        pos = TABLE.size + STREAM_HEADER.size
+        states = [STATE.unpack_from(data, pos + j * STATE.size)[0] for j in range(streams)]
+        pos += streams * STATE.size
+        freq, start, slots, mask = self._freq, self._start, self._slots, (1 << PROB_BITS) - 1
+        out = bytearray(count)
+        try:
+            for i in range(count):
+                j = i % streams
+                x = states[j]
+                slot = x & mask
+                s = slots[slot]
+                x = freq[s] * (x >> PROB_BITS) + slot - start[s]
+                while x < LOWER:
+                    x = x << 8 | data[pos]
+                    pos += 1
+                states[j] = x
+                out[i] = s
+        except IndexError:
+            raise ValueError("Flux rANS trunchiat") from None
+        if any(x != LOWER for x in states):     ## encoderul a pornit fiecare stare de la LOWER
+            raise ValueError("Flux rANS invalid")
+        return index_letters(out)
+
+    def bits_per_letter(self, data) -> float:
+        count = STREAM_HEADER.unpack_from(data, TABLE.size)[1]
+        return len(data) * 8 / count if count else 0.0
@@ -0,0 +1,139 @@
+import tkinter as tk
+from bisect import bisect_left, bisect_right
+from compression import NO_NODE
+from instrument import STATS
+from treelayout import TreeLayout
+
+
+class TreeCanvas(tk.Frame):
+    """Scrollable, zoomable code tree that only creates canvas items for the visible part.
+
+    The layout is computed once at scale 1; zoom and scroll just re-render the viewport.
+    Subtrees narrower than MIN_SUBTREE_PX on screen are drawn as a single triangle.
+    """
+    X_STEP, Y_STEP = 60, 80         ## distanța dintre frunze / niveluri, la scara 1
+    NODE_RADIUS = 20
+    MARGIN_X, MARGIN_Y = 50, 30
+    MIN_SUBTREE_PX = 24             ## sub această lățime un subarbore devine un glif
+    MIN_TEXT_RADIUS = 10            ## sub această rază nodurile nu mai au text
+
+    def __init__(self, parent, tree, title="Arbore"):
+        super().__init__(parent)
+        self.tree = tree         ## compression.CodeTree
+
+        # Canvas + Scrollbars
+        self.canvas = tk.Canvas(self, bg="white", width=1200, height=600)
+        self.hbar = tk.Scrollbar(self, orient="horizontal", command=self.scroll_x)
+        self.vbar = tk.Scrollbar(self, orient="vertical", command=self.scroll_y)
+        self.canvas.config(xscrollcommand=self.hbar.set, yscrollcommand=self.vbar.set)
+
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.hbar.grid(row=1, column=0, sticky="we")
+        self.vbar.grid(row=0, column=1, sticky="ns")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.canvas.bind("<MouseWheel>", self.zoom)  # scroll zoom
+        self.canvas.bind("<Configure>", lambda event: self.schedule_draw())
+        self.scale = 1.0
+        self.draw_pending = False
+
+        self.layout_tree()
+        self.update_scrollregion()
+        self.draw_tree()
+
+    def layout_tree(self):
+        """Positions, depth rows and subtree sizes, computed once per tree."""
+        self.layout = TreeLayout(self.tree, self.X_STEP, self.Y_STEP, self.MARGIN_X, self.MARGIN_Y)
+
+    def update_scrollregion(self):
+        if self.layout.positions:
+            self.canvas.configure(scrollregion=(0, 0, self.layout.width * self.scale, self.layout.height * self.scale))
+
+    def scroll_x(self, *args):
+        self.canvas.xview(*args)
+        self.schedule_draw()
+
+    def scroll_y(self, *args):
+        self.canvas.yview(*args)
+        self.schedule_draw()
+
+    def zoom(self, event):
+        factor = 1.1 if event.delta > 0 else 0.9
+        # punctul de sub mouse rămâne pe loc
+        lx = self.canvas.canvasx(event.x) / self.scale
+        ly = self.canvas.canvasy(event.y) / self.scale
+        self.scale *= factor
+        self.update_scrollregion()
+        if self.layout.positions:
+            self.canvas.xview_moveto(max(0.0, (lx * self.scale - event.x) / (self.layout.width * self.scale)))
+            self.canvas.yview_moveto(max(0.0, (ly * self.scale - event.y) / (self.layout.height * self.scale)))
+        self.schedule_draw()
+
+    def schedule_draw(self):
+        """Coalesces scroll/zoom/resize events into one redraw per idle cycle."""
+        if not self.draw_pending:
+            self.draw_pending = True
+            self.after_idle(self.draw_tree)
+
+    def draw_tree(self):
+        with STATS.timer("draw_tree"):
+            self._draw_tree()
+
+    def _draw_tree(self):
+        self.draw_pending = False
+        canvas = self.canvas
+        canvas.delete("all")
+        layout, symbols, freq = self.layout, self.tree.symbols, self.tree.freq
+        if not layout.positions: return
+
+        s = self.scale
+        r = max(self.NODE_RADIUS * s, 2)
+        min_leaves = self.MIN_SUBTREE_PX / (self.X_STEP * s)     ## sub atâtea frunze subarborele e un glif
+
+        # fereastra vizibilă, în coordonatele de la scara 1
+        x0 = canvas.canvasx(0) / s - self.NODE_RADIUS
+        x1 = canvas.canvasx(canvas.winfo_width()) / s + self.NODE_RADIUS
+        y0 = canvas.canvasy(0) / s - self.NODE_RADIUS
+        y1 = canvas.canvasy(canvas.winfo_height()) / s + self.NODE_RADIUS
+        first = max(0, int((y0 - self.MARGIN_Y) // self.Y_STEP))
+        last = min(len(layout.rows) - 1, int((y1 - self.MARGIN_Y) // self.Y_STEP) + 1)
+
+        # Draw edges (a row of edges spans from its depth to the next one)
+        for depth in range(max(0, first - 1), last):
+            if layout.row_max_leaves[depth] < min_leaves: break ## tot ce urmează e în glife
+            edges, ends = layout.edge_rows[depth], layout.edge_ends[depth]
+            for ex0, ex1, node, child in edges[bisect_left(ends, x0):]:
+                if ex0 > x1: break
+                if layout.leaves[node] < min_leaves: continue   ## în interiorul unui glif
+                x, y = layout.positions[node]
+                x2, y2 = layout.positions[child]
+                canvas.create_line(x * s, y * s, x2 * s, y2 * s, smooth=True)
+
+        # Draw nodes
+        for depth in range(first, last + 1):
+            if depth and layout.row_max_leaves[depth - 1] < min_leaves: break
+            row, xs = layout.rows[depth], layout.row_xs[depth]
+            for node in row[bisect_left(xs, x0):bisect_right(xs, x1)]:
+                parent = layout.parents[node]
+                if parent != NO_NODE and layout.leaves[parent] < min_leaves:
+                    continue        ## ascuns în glif-ul unui strămoș
+                x, y = layout.positions[node]
+                symbol = symbols[node]
+                if symbol is None and layout.leaves[node] < min_leaves:
+                    self.draw_glyph(node, x * s, y * s, r)
+                    continue
+                color = "#cfe6ff" if symbol else "#ffddb3"
+                canvas.create_oval(x*s-r, y*s-r, x*s+r, y*s+r, fill=color, outline="#4a6fa5", width=2)
+                if r >= self.MIN_TEXT_RADIUS:
+                    text = f"{symbol}\n{freq[node]}" if symbol else f"{freq[node]}"
+                    canvas.create_text(x*s, y*s, text=text, font=("Arial", 9), justify="center")
+
+    def draw_glyph(self, node, x, y, r):
+        """A collapsed subtree: one triangle over the x-range of its leaves."""
+        s, layout = self.scale, self.layout
+        left, right = layout.spans[node]
+        self.canvas.create_polygon(x, y - r, left * s - r, y + 2 * r, right * s + r, y + 2 * r,
+                                   fill="#ffddb3", outline="#4a6fa5", width=1)
+        if r >= self.MIN_TEXT_RADIUS:
+            self.canvas.create_text(x, y + r, text=f"{layout.leaves[node]}", font=("Arial", 8))
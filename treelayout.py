@@ -0,0 +1,79 @@
+from compression import NO_NODE
+
+
+class TreeLayout:
+    """Positions, depth rows and subtree sizes of a CodeTree, without any Tk.
+
+    Leaves are placed left to right X_STEP apart and every internal node sits halfway
+    between its children. The tree is walked with an explicit stack, so degenerate
+    (very deep) trees do not hit the recursion limit. Everything is indexed by node id.
+    """
+
+    def __init__(self, tree, x_step=60, y_step=80, margin_x=50, margin_y=30):
+        self.tree = tree
+        size = len(tree) if tree is not None else 0
+        self.positions = [None] * size      ## id -> (x, y)
+        self.leaves = [0] * size            ## id -> numărul de frunze din subarbore
+        self.spans = [None] * size          ## id -> (x minim, x maxim) al frunzelor din subarbore
+        self.parents = [NO_NODE] * size
+        self.rows = []          ## pe fiecare adâncime: noduri sortate după x
+        self.row_xs = []
+        self.row_max_leaves = []
+        self.edge_rows = []     ## pe fiecare adâncime: muchii (x0, x1, părinte, copil) sortate după x
+        self.edge_ends = []
+        self.width = self.height = 0
+        if not size or tree.root == NO_NODE: return
+        self._assign(tree, x_step, y_step)
+        positions, leaves, spans, rows = self.positions, self.leaves, self.spans, self.rows
+
+        # Normalize margin
+        min_x = min(x for x, _ in positions)
+        for node, (x, y) in enumerate(positions):
+            positions[node] = (x - min_x + margin_x, y + margin_y)
+        for node, (x0, x1) in enumerate(spans):
+            spans[node] = (x0 - min_x + margin_x, x1 - min_x + margin_x)
+
+        # în ordinea de parcurgere nodurile unui nivel sunt deja crescătoare după x
+        self.row_xs = [[positions[node][0] for node in row] for row in rows]
+        self.row_max_leaves = [max(leaves[node] for node in row) for row in rows]
+        left, right = tree.left, tree.right
+        for row in rows:
+            edges = []
+            for node in row:
+                x = positions[node][0]
+                for child in (left[node], right[node]):
+                    if child != NO_NODE:
+                        cx = positions[child][0]
+                        edges.append((min(x, cx), max(x, cx), node, child))
+            self.edge_rows.append(edges)
+        self.edge_ends = [[edge[1] for edge in edges] for edges in self.edge_rows]
+        self.width = max(x for x, _ in positions) + margin_x
+        self.height = max(y for _, y in positions) + margin_y
+
+    def _assign(self, tree, x_step, y_step):
+        """Leaf order positions, subtree sizes and depth rows, children before parents."""
+        positions, leaves, spans, parents, rows = self.positions, self.leaves, self.spans, self.parents, self.rows
+        left, right = tree.left, tree.right
+        # post-ordine: un nod intern e vizitat de două ori, a doua oară după ambii copii
+        next_x, stack = 1, [(tree.root, 0, False)]
+        while stack:
+            node, depth, children_done = stack.pop()
+            if len(rows) <= depth:
+                rows.append([])
+            l, r = left[node], right[node]
+            if l == NO_NODE:
+                positions[node] = (next_x * x_step, depth * y_step)
+                leaves[node] = 1
+                spans[node] = (positions[node][0],) * 2
+                next_x += 1
+            elif not children_done:
+                stack.append((node, depth, True))
+                stack.append((r, depth + 1, False))
+                stack.append((l, depth + 1, False))
+                continue
+            else:
+                parents[l] = parents[r] = node
+                positions[node] = ((positions[l][0] + positions[r][0]) / 2, depth * y_step)
+                leaves[node] = leaves[l] + leaves[r]
+                spans[node] = (spans[l][0], spans[r][1])
+            rows[depth].append(node)